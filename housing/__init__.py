@@ -0,0 +1 @@
+# Supporting code for the housing prices case study app (main.py).
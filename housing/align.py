@@ -0,0 +1,209 @@
+# Calendar alignment of mixed-frequency series into one combined frame.
+#
+# This replaces the per-series resample('A') -> data/cleaned/annual/*.csv ->
+# 3_combined.xlsx -> fillna(df.mean()) steps of data_resampling.ipynb and
+# 3.ipynb. All inputs are stacked into one long (period, series, value) table
+# and aggregated with a single groupby, so N series of weekly, monthly,
+# quarterly or annual data are brought to the target frequency in one pass.
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from housing import data as datasets
+from housing.data import ROOT
+from housing.pyramid import LEVELS, open_pyramid
+from housing.store import open_store
+
+# Resample alias -> the matching period alias.
+PERIODS = {'W': 'W', 'ME': 'M', 'QE': 'Q', 'YE': 'Y'}
+
+FILL_METHODS = ('mean', 'ffill', 'bfill', 'interpolate')
+
+
+def period_alias(freq):
+    return PERIODS.get(freq, freq)
+
+
+def _read_yearly(path):
+    # The foreclosure/existing-sales tables are keyed by a bare year column.
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    index = pd.to_datetime(df.iloc[:, 0].astype(str), format='%Y')
+    return pd.Series(df.iloc[:, 1].to_numpy(dtype='float64'), index=index)
+
+
+def _fill_column(s, methods, limit):
+    for method in methods:
+        if method == 'mean':
+            s = s.fillna(s.mean())
+        elif method == 'ffill':
+            s = s.ffill(limit=limit)
+        elif method == 'bfill':
+            s = s.bfill(limit=limit)
+        elif method == 'interpolate':
+            s = s.interpolate(method='time', limit=limit, limit_area='inside')
+        else:
+            raise ValueError('unknown fill method %r (expected one of %s)' % (method, ', '.join(FILL_METHODS)))
+    return s
+
+
+def fill_gaps(df, fill, limit=None):
+    """Fill gaps in an aligned frame.
+
+    ``fill`` is a method name, a sequence of methods applied in order (e.g.
+    ``('interpolate', 'ffill')``), or a dict of column -> method(s).
+    """
+    if fill is None:
+        return df
+    if isinstance(fill, dict):
+        out = df.copy()
+        for col, methods in fill.items():
+            methods = (methods,) if isinstance(methods, str) else methods
+            out[col] = _fill_column(df[col], methods, limit)
+        return out
+    methods = (fill,) if isinstance(fill, str) else tuple(fill)
+    return df.apply(_fill_column, args=(methods, limit))
+
+
+def align(series, freq='YE', start=None, end=None, how='mean', fill=None, limit=None):
+    """Align a dict of name -> Series (DatetimeIndex) onto one calendar.
+
+    Every observation is mapped to its period at ``freq`` and all series are
+    aggregated with ``how`` in a single grouped pass over the concatenated
+    long table. The result spans every period between ``start`` and ``end``
+    (by default the union of the inputs), is labelled with period-end dates
+    like ``resample`` would, and has gaps filled per ``fill_gaps``.
+    """
+    names = list(series)
+    parts = [series[n].dropna() for n in names]
+    dates = pd.DatetimeIndex(np.concatenate([p.index.to_numpy(dtype='datetime64[ns]') for p in parts]))
+    values = np.concatenate([p.to_numpy(dtype='float64') for p in parts])
+    codes = np.repeat(np.arange(len(names)), [len(p) for p in parts])
+
+    periods = dates.to_period(period_alias(freq))
+    long = pd.DataFrame({'period': periods, 'series': codes, 'value': values})
+    wide = long.groupby(['period', 'series'], sort=False)['value'].agg(how).unstack('series')
+
+    first = pd.Period(start, period_alias(freq)) if start is not None else periods.min()
+    last = pd.Period(end, period_alias(freq)) if end is not None else periods.max()
+    wide = wide.reindex(index=pd.period_range(first, last), columns=range(len(names)))
+    wide.columns = names
+    wide.index = wide.index.to_timestamp(how='end').normalize()
+    wide.index.name = 'DATE'
+    return fill_gaps(wide, fill, limit)
+
+
+# Yearly tables that are not FRED series and so are not in the store.
+YEARLY_SOURCES = {
+    'Foreclosures': os.path.join(ROOT, 'data', 'cleaned', 'foreclosures.csv'),
+    'Existing Homes Sold': os.path.join(ROOT, 'data', 'cleaned', 'existinghomessold.csv'),
+}
+
+
+# Months from an observation's date to its first release, rounded up, per
+# combined column. Annual totals are dated January 1st of the year they
+# describe and come out long after it ends; monthly data is dated the first
+# of its month and out within the next one.
+RELEASE_LAG = {
+    'Income': 21,
+    'Foreclosures': 14,
+    'Population': 2,
+    'Existing Homes Sold': 14,
+    'Tot Permits Issued': 2,
+    'Single Family Units Sold': 2,
+    'Unemployment': 2,
+    'MDSP': 6,
+    'Family Size': 12,
+    'Mortgage': 0,
+    'CSUSHPISA': 0,
+}
+
+
+def as_released(series, lags=RELEASE_LAG):
+    """Re-date every series to when its observations were first released."""
+    return {name: s.set_axis(s.index + pd.DateOffset(months=lags.get(name, 0)))
+            for name, s in series.items()}
+
+
+def combined_version():
+    """Hash of every input of build_combined(), for keying caches.
+
+    Cheap enough for every rerun: the store's version is computed once per
+    build and the yearly tables are only re-hashed when they are touched.
+    """
+    h = hashlib.sha1(open_store().version().encode())
+    for name in sorted(YEARLY_SOURCES):
+        h.update(datasets.version(YEARLY_SOURCES[name]).encode())
+    return h.hexdigest()
+
+
+def combined_sources(freq=None):
+    """The series behind finalcombined.csv, under its column names.
+
+    With ``freq`` one of the pyramid levels, the store series come already
+    averaged per period from the pyramid (housing/pyramid.py) rather than as
+    raw observations, so aligning them is a lookup.
+    """
+    if freq in LEVELS:
+        pyramid = open_pyramid()
+
+        def get(sid):
+            return pyramid.series(sid, freq)
+    else:
+        get = open_store().series
+    return {
+        'Income': get('MEHOINUSA672N'),
+        'Foreclosures': _read_yearly(YEARLY_SOURCES['Foreclosures']),
+        'Population': get('POPTHM') * 1000,
+        'Existing Homes Sold': _read_yearly(YEARLY_SOURCES['Existing Homes Sold']),
+        'Tot Permits Issued': get('PERMIT1'),
+        'Single Family Units Sold': get('HSN1F'),
+        'Unemployment': get('UNRATE'),
+        'MDSP': get('MDSP'),
+        'Family Size': get('CNP16OV_TTLHH'),
+        'Mortgage': get('MORTGAGE30US'),
+        'CSUSHPISA': get('CSUSHPISA'),
+    }
+
+
+def build_combined(freq='YE', start='2000', end=None, fill='mean', limit=None, released=False):
+    """Rebuild the combined factor frame at any frequency.
+
+    The defaults follow how finalcombined.csv was made (annual means since
+    2000, gaps filled with the column mean) but start from the full raw
+    series rather than the 80-quarter cleaned extracts; e.g. ``freq='QE',
+    fill=('interpolate', 'mean')`` gives a quarterly version.
+
+    With ``released`` every series is dated by its release (RELEASE_LAG),
+    so that together with ``fill='ffill'`` each row only holds what was
+    public at its date, as a forecast made then would have seen it. The
+    lags count from the raw observation dates, so the series are then
+    aligned from the store rather than taken period-end dated from the
+    pyramid.
+    """
+    if released:
+        sources = as_released(combined_sources())
+    else:
+        sources = combined_sources(freq)
+    return align(sources, freq=freq, start=start, end=end, fill=fill, limit=limit)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build the combined factor dataset at a given frequency.')
+    parser.add_argument('--freq', default='YE', choices=sorted(PERIODS))
+    parser.add_argument('--start', default='2000')
+    parser.add_argument('--end', default=None)
+    parser.add_argument('--fill', default='mean', help='comma-separated fill methods, or "none"')
+    parser.add_argument('-o', '--output', default=None, help='CSV path (default: stdout)')
+    opts = parser.parse_args()
+
+    fill = None if opts.fill == 'none' else opts.fill.split(',')
+    df = build_combined(opts.freq, opts.start, opts.end, fill)
+    if opts.output:
+        df.to_csv(opts.output)
+    else:
+        print(df.to_csv())
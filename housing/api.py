@@ -0,0 +1,238 @@
+# Read-only HTTP API over the data behind the app.
+#
+# `python -m housing.api [--port 8502]` serves, next to the Streamlit app:
+#
+#   /datasets                   name, path and version of every dataset
+#   /datasets/<name>            a cleaned dataset or 'combined' (finalcombined.csv)
+#   /series/<id>                a raw FRED series from the columnar store
+#   /analysis/correlation       correlation matrix of finalcombined.csv
+#
+# Tables take ?start=&end= (dates, inclusive) and ?columns=a,b, and come as
+# JSON (pandas 'split' layout) or, with ?format=arrow or an Accept of
+# application/vnd.apache.arrow.stream, as an Arrow IPC stream (needs
+# pyarrow). Every response carries an ETag built from the content hash of
+# the data files and the query, so a client polling with If-None-Match gets
+# a 304 without the data being parsed or encoded. Bodies are gzip-streamed
+# to clients that accept it; the ETag is weak, since the gzip and identity
+# bodies of one version share it.
+
+import functools
+import gzip
+import hashlib
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from housing import data as datasets
+from housing.store import open_store
+
+ARROW = 'application/vnd.apache.arrow.stream'
+CHUNK = 1 << 16
+# Date column of the cleaned datasets, in order of preference.
+DATE_COLUMNS = ('DATE', 'Date', 'Year')
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+@functools.lru_cache(maxsize=4)
+def _correlation(version):
+    corr = datasets.load('combined').drop(columns=['DATE']).corr()
+    return corr.rename_axis('factor').reset_index()
+
+
+def _window(df, start, end):
+    """Rows of ``df`` whose date column lies between ``start`` and ``end``."""
+    if start is None and end is None:
+        return df
+    column = next((c for c in DATE_COLUMNS if c in df.columns), None)
+    if column is None:
+        raise ApiError(400, 'this table has no date column')
+    dates = df[column].astype(str)
+    dates = pd.to_datetime(dates, format='%Y') if column == 'Year' else pd.to_datetime(dates)
+    keep = pd.Series(True, index=df.index)
+    try:
+        if start is not None:
+            keep &= dates >= pd.Timestamp(start)
+        if end is not None:
+            keep &= dates <= pd.Timestamp(end)
+    except ValueError:
+        raise ApiError(400, 'start and end must be dates')
+    return df[keep]
+
+
+def _project(df, columns, keep=()):
+    if columns is None:
+        return df
+    wanted = [c for c in columns.split(',') if c]
+    missing = [c for c in wanted if c not in df.columns]
+    if missing:
+        raise ApiError(400, 'unknown columns: %s' % ', '.join(missing))
+    return df[[c for c in keep if c in df.columns and c not in wanted] + wanted]
+
+
+class Resource:
+    """A table the API serves: its data version and a way to build it."""
+
+    def __init__(self, version, table, keep=()):
+        self.version = version
+        self.table = table
+        # Columns kept under a projection (the date or the row label).
+        self.keep = keep
+
+
+def resolve(path):
+    """The Resource for a URL path, or None for JSON-only listings."""
+    parts = [p for p in path.split('/') if p]
+    if parts in ([], ['datasets']):
+        return None
+    if len(parts) == 2 and parts[0] == 'datasets' and parts[1] in datasets.DATASETS:
+        name = parts[1]
+        return Resource(lambda: datasets.version(name), lambda: datasets.load(name), DATE_COLUMNS)
+    if len(parts) == 2 and parts[0] == 'series':
+        store = open_store(rebuild=False)
+        sid = parts[1]
+        if sid not in store:
+            raise ApiError(404, 'no series %r' % sid)
+        return Resource(lambda: store.digest(sid),
+                        lambda: store.series(sid).rename_axis('DATE').reset_index(), DATE_COLUMNS)
+    if parts == ['analysis', 'correlation']:
+        return Resource(lambda: datasets.version('combined'),
+                        lambda: _correlation(datasets.version('combined')), ('factor',))
+    raise ApiError(404, 'not found: /%s' % '/'.join(parts))
+
+
+def qvalues(header):
+    """{token: q} of an Accept-style header; q defaults to 1."""
+    out = {}
+    for part in header.split(','):
+        token, *params = [p.strip() for p in part.split(';')]
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        out[token.lower()] = q
+    return out
+
+
+def accepts(header, token, wildcard='*'):
+    """Whether ``header`` accepts ``token``: listed, or covered by the wildcard, with q > 0."""
+    q = qvalues(header)
+    return q.get(token, q.get(wildcard, 0.0)) > 0
+
+
+def listing():
+    return {name: {'path': path, 'version': datasets.version(name)}
+            for name, path in datasets.DATASETS.items()}
+
+
+def encode_json(df):
+    return df.to_json(orient='split', index=False, date_format='iso').encode()
+
+
+def encode_arrow(df):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ApiError(406, 'Arrow output needs pyarrow')
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _opaque(etag):
+    """The quoted part of an ETag; If-None-Match compares weakly."""
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = 'HousingAPI/1.0'
+
+    def do_GET(self):
+        try:
+            self._get()
+        except ApiError as e:
+            self._send(e.status, json.dumps({'error': str(e)}).encode(), 'application/json')
+        except Exception as e:
+            self.log_error('%s: %r', self.path, e)
+            self._send(500, json.dumps({'error': 'internal error'}).encode(), 'application/json')
+
+    def _get(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        resource = resolve(url.path)
+        if resource is None:
+            self._send(200, json.dumps(listing()).encode(), 'application/json')
+            return
+
+        fmt = query.get('format') or ('arrow' if accepts(self.headers.get('Accept', ''), ARROW, None) else 'json')
+        if fmt not in ('json', 'arrow'):
+            raise ApiError(400, 'format must be json or arrow')
+        params = (url.path, query.get('start'), query.get('end'), query.get('columns'), fmt)
+        etag = 'W/"%s"' % hashlib.sha1(repr((resource.version(),) + params).encode()).hexdigest()
+        if _opaque(etag) in [_opaque(t.strip()) for t in self.headers.get('If-None-Match', '').split(',')]:
+            self._send(304, b'', None, etag)
+            return
+
+        df = _project(_window(resource.table(), query.get('start'), query.get('end')),
+                      query.get('columns'), resource.keep)
+        if fmt == 'arrow':
+            self._send(200, encode_arrow(df), ARROW, etag)
+        else:
+            self._send(200, encode_json(df), 'application/json', etag)
+
+    def _send(self, status, body, content_type, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            # Clients may keep the body but must revalidate it every time.
+            self.send_header('Cache-Control', 'no-cache')
+        if status == 304:
+            self.end_headers()
+            return
+        self.send_header('Content-Type', content_type)
+        self.send_header('Vary', 'Accept, Accept-Encoding')
+        if accepts(self.headers.get('Accept-Encoding', ''), 'gzip'):
+            # No Content-Length: the compressed stream ends with the
+            # connection (HTTP/1.0).
+            self.send_header('Content-Encoding', 'gzip')
+            self.end_headers()
+            with gzip.GzipFile(fileobj=self.wfile, mode='wb', compresslevel=6) as out:
+                for i in range(0, len(body), CHUNK):
+                    out.write(body[i:i + CHUNK])
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+def serve(host='127.0.0.1', port=8502):
+    server = ThreadingHTTPServer((host, port), Handler)
+    print('Serving on http://%s:%d/' % (host, port))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve the cleaned data and analysis results over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args()
+    serve(args.host, args.port)
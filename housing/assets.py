@@ -0,0 +1,112 @@
+# Pre-optimized image variants for the illustrations shown in main.py.
+#
+# `python -m housing.assets` writes resized, recompressed WebP copies of each
+# source PNG at a few widths into static/img/, plus a manifest. Streamlit
+# serves static/ as plain static files (server.enableStaticServing), so the
+# browser picks a variant through srcset and the app never decodes or
+# re-encodes the originals per session.
+
+import json
+import os
+
+from housing.data import ROOT, file_hash
+
+STATIC_DIR = os.path.join(ROOT, 'static')
+IMG_DIR = os.path.join(STATIC_DIR, 'img')
+MANIFEST = os.path.join(IMG_DIR, 'manifest.json')
+# URL prefix Streamlit mounts the static/ folder under.
+STATIC_URL = 'app/static/img'
+
+IMAGES = ['aff.png', 'new_perms.png', 'subprime_mort.png']
+WIDTHS = (480, 800, 1200)
+QUALITY = 80
+
+
+def _load_manifest(path=MANIFEST):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def build(images=IMAGES, widths=WIDTHS, quality=QUALITY, force=False):
+    """Write WebP variants for ``images``; returns the names that were rebuilt."""
+    from PIL import Image
+
+    os.makedirs(IMG_DIR, exist_ok=True)
+    manifest = _load_manifest()
+    rebuilt = []
+    for name in images:
+        src = os.path.join(ROOT, name)
+        digest = file_hash(src)
+        entry = manifest.get(name)
+        if not force and entry and entry['digest'] == digest and all(
+                os.path.exists(os.path.join(IMG_DIR, v['file'])) for v in entry['variants']):
+            continue
+
+        stem = os.path.splitext(name)[0]
+        with Image.open(src) as img:
+            img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+            variants = []
+            # Never upscale; the original width is always one of the variants.
+            for width in sorted({w for w in widths if w < img.width} | {img.width}):
+                height = round(img.height * width / img.width)
+                out = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+                fname = '%s-%d.webp' % (stem, width)
+                out.save(os.path.join(IMG_DIR, fname), 'WEBP', quality=quality, method=6)
+                variants.append({'file': fname, 'width': width, 'height': height,
+                                 'bytes': os.path.getsize(os.path.join(IMG_DIR, fname))})
+        manifest[name] = {'digest': digest, 'bytes': os.path.getsize(src), 'variants': variants}
+        rebuilt.append(name)
+
+    # Drop images that are no longer shown, so they are not deployed or exported.
+    for name in [n for n in manifest if n not in IMAGES]:
+        for v in manifest.pop(name)['variants']:
+            path = os.path.join(IMG_DIR, v['file'])
+            if os.path.exists(path):
+                os.remove(path)
+
+    with open(MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return rebuilt
+
+
+_cached = {'mtime': None, 'manifest': {}}
+
+
+def manifest():
+    """The current manifest, re-read only when the file changes."""
+    try:
+        mtime = os.stat(MANIFEST).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if _cached['mtime'] != mtime:
+        _cached['manifest'] = _load_manifest()
+        _cached['mtime'] = mtime
+    return _cached['manifest']
+
+
+def img_tag(name, alt=''):
+    """A responsive <img> tag for ``name``, or None if it has not been built."""
+    entry = manifest().get(name)
+    if not entry:
+        return None
+    variants = entry['variants']
+    srcset = ', '.join('%s/%s %dw' % (STATIC_URL, v['file'], v['width']) for v in variants)
+    # Default to the largest variant no wider than 800px for old browsers.
+    default = max((v for v in variants if v['width'] <= 800), key=lambda v: v['width'], default=variants[0])
+    return ('<img src="%s/%s" srcset="%s" sizes="(max-width: 800px) 100vw, 50vw" alt="%s" '
+            'loading="lazy" decoding="async" style="width:100%%;height:auto">'
+            % (STATIC_URL, default['file'], srcset, alt))
+
+
+if __name__ == '__main__':
+    import sys
+
+    rebuilt = build(force='--force' in sys.argv)
+    for name, entry in sorted(manifest().items()):
+        total = sum(v['bytes'] for v in entry['variants'])
+        print('%-32s %8d bytes -> %s%s' % (
+            name, entry['bytes'],
+            ', '.join('%dw:%d' % (v['width'], v['bytes']) for v in entry['variants']),
+            ' (rebuilt)' if name in rebuilt else ''))
@@ -0,0 +1,438 @@
+# Benchmark suite for the app and the analysis pipeline.
+#
+# `python -m housing.benchmark` times three groups of work and records wall
+# time and peak Python heap (tracemalloc) for each:
+#
+#   app       every section of main.py rendered headlessly through Streamlit's
+#             AppTest harness, cold (every cache emptied and the housing
+#             modules reimported first) and warm (rerun);
+#   etl       store packing, the cleaning jobs and calendar alignment;
+#   analysis  correlation, rolling/lagged correlation, bootstrap intervals,
+#             OLS and the best-subset search.
+#
+# The etl and analysis steps run on the real data and on synthetic data with
+# the same shape scaled 10x, 100x and 1000x along one axis at a time: series
+# length ("length") or number of series ("count"). Steps whose estimated
+# footprint exceeds --max-mb, or whose time extrapolated from the previous
+# scale exceeds --max-seconds, are recorded as skipped rather than attempted.
+# Each run is written to benchmarks/<timestamp>.json and compared against the
+# previous run.
+
+import glob
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from math import comb
+
+import numpy as np
+import pandas as pd
+
+from housing import align, bootstrap, correlation, etl, regression, store
+from housing.data import ROOT
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks')
+
+SCALES = (10, 100, 1000)
+AXES = ('length', 'count')
+
+
+def traced(fn):
+    """Run ``fn`` once under tracemalloc; returns (seconds, peak MiB, result)."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak / 2 ** 20, result
+
+
+def measure(fn, repeat=3, budget=10.0):
+    """Peak traced allocation and best/median wall time of ``fn``.
+
+    Returns (best s, median s, peak MiB, result). The first run is traced
+    for the peak and doubles as a warm-up; the timed repeats are untraced,
+    as tracemalloc slows allocation-heavy code down. When the traced run
+    alone exceeds ``budget`` seconds its own time is reported instead.
+    """
+    first, peak, result = traced(fn)
+    if first > budget:
+        return first, first, peak, result
+    times = []
+    while len(times) < max(repeat, 1) and sum(times) < budget:
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), float(np.median(times)), peak, result
+
+
+def _record(group, step, data, seconds=None, median=None, peak_mb=None, skipped=None, **extra):
+    rec = {'group': group, 'step': step, 'data': data}
+    if skipped is not None:
+        rec['skipped'] = skipped
+    else:
+        rec.update(seconds=round(seconds, 6), median=round(median, 6), peak_mb=round(peak_mb, 2))
+    rec.update(extra)
+    return rec
+
+
+# --- app -------------------------------------------------------------------
+
+def _forget_caches():
+    """Empty every cache the app fills, so the next render starts cold.
+
+    Besides the st.cache_* stores, the housing modules are dropped and get
+    reimported by the next run, taking their module-level caches (datasets,
+    figures, store handles) with them.
+    """
+    import streamlit as st
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    package = sys.modules['housing']
+    for name in [m for m in sys.modules if m.startswith('housing.') and m != 'housing.benchmark']:
+        del sys.modules[name]
+        # `from housing import x` would otherwise find the old module on the package.
+        if hasattr(package, name.split('.', 1)[1]):
+            delattr(package, name.split('.', 1)[1])
+
+
+def bench_app(timeout=300):
+    """Cold and warm render time of every section of main.py."""
+    from streamlit.testing.v1 import AppTest
+
+    # Sections are rendered once each way, so time and peak come from the
+    # same (traced) run: a second run would no longer be cold.
+    _forget_caches()
+    at = AppTest.from_file(os.path.join(ROOT, 'main.py'), default_timeout=timeout)
+    seconds, peak, _ = traced(at.run)
+    results = [_record('app', 'main.py', 'cold', seconds, seconds, peak)]
+    pages = sorted(os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, 'sections', '*.py')))
+    for page in pages:
+        for phase in ('cold', 'warm'):
+            if phase == 'cold':
+                _forget_caches()
+            seconds, peak, _ = traced(lambda: at.switch_page(page).run())
+            errors = [str(e.value) for e in at.exception]
+            results.append(_record('app', page, phase, seconds, seconds, peak,
+                                   **({'errors': errors} if errors else {})))
+    return results
+
+
+# --- synthetic data --------------------------------------------------------
+
+def synthetic_series(template, n, seed):
+    """A random walk with ``n`` points over the same span and level as ``template``."""
+    rng = np.random.default_rng(seed)
+    lo, hi = template.index[0].value // 10 ** 9, template.index[-1].value // 10 ** 9
+    dates = np.linspace(lo, hi, n).astype('int64').astype('datetime64[s]')
+    walk = np.cumsum(rng.standard_normal(n))
+    walk = (walk - walk.mean()) / (walk.std() or 1.0)
+    values = template.mean() + walk * (template.std() or 1.0)
+    return pd.Series(values, index=pd.DatetimeIndex(dates))
+
+
+def synthetic_store_series(real, scale=1, axis='length', seed=0):
+    """Real store series scaled ``scale`` times in length or in count."""
+    out = {}
+    ids = sorted(real)
+    count = len(ids) * (scale if axis == 'count' else 1)
+    for i in range(count):
+        template = real[ids[i % len(ids)]]
+        n = len(template) * (scale if axis == 'length' else 1)
+        out['S%05d' % i] = synthetic_series(template, n, seed + i)
+    return out
+
+
+def synthetic_frame(rows, cols, target=regression.TARGET, seed=0):
+    """``cols`` factors and a target sharing a common trend, like the combined data."""
+    rng = np.random.default_rng(seed)
+    trend = np.cumsum(rng.standard_normal(rows))
+    loadings = rng.uniform(-1, 1, cols)
+    X = trend[:, None] * loadings + np.cumsum(rng.standard_normal((rows, cols)), axis=0) * 0.5
+    y = X[:, :min(cols, 3)].sum(axis=1) + rng.standard_normal(rows)
+    df = pd.DataFrame(X, columns=['F%05d' % i for i in range(cols)])
+    df[target] = y
+    return df
+
+
+def _shapes(base, scales, axes):
+    """(label, rows, cols) for the real shape and every scaled variant."""
+    rows, cols = base
+    yield 'real', rows, cols
+    for axis in axes:
+        for s in scales:
+            yield '%s x%d' % (axis, s), rows * (s if axis == 'length' else 1), cols * (s if axis == 'count' else 1)
+
+
+class Projection:
+    """Skips scaled runs whose time, extrapolated from the previous scale, is over budget.
+
+    ``work`` is any measure the step's cost grows in proportion to (values
+    processed, or a flop count), so the projection is seconds * work / work
+    at the last scale that was actually run.
+    """
+
+    def __init__(self, max_seconds=None):
+        self.max_seconds = max_seconds
+        self._last = {}
+
+    def skip(self, step, axis, work):
+        last = self._last.get((step, axis)) or self._last.get((step, None))
+        if self.max_seconds is None or last is None:
+            return None
+        seconds, at = last
+        projected = seconds * work / at
+        if projected > self.max_seconds:
+            return 'projected %.0f s, over the %d s budget' % (projected, self.max_seconds)
+        return None
+
+    def add(self, step, axis, work, seconds):
+        self._last[(step, axis)] = (seconds, work)
+
+
+# --- etl -------------------------------------------------------------------
+
+ETL_STEPS = ('store.write', 'etl.run_job', 'etl.run_job (unchanged)', 'align')
+
+
+def bench_etl(scales=SCALES, axes=AXES, repeat=3, max_mb=2048, max_seconds=300):
+    real_store = store.open_store()
+    real = {sid: real_store.series(sid) for sid in real_store.names()}
+    cases = [('real', 1, None)] + [('%s x%d' % (a, s), s, a) for a in axes for s in scales]
+    projection = Projection(max_seconds)
+    results = []
+    for label, scale, axis in cases:
+        n_values = sum(map(len, real.values())) * scale
+        # Raw arrays, per-series Series copies, the long align table and the
+        # grouped intermediates: roughly ten 8-byte words per observation.
+        skipped = {}
+        if n_values * 80 / 2 ** 20 > max_mb:
+            skipped = dict.fromkeys(ETL_STEPS, 'estimated footprint over %d MB' % max_mb)
+        for step in ETL_STEPS:
+            skipped.setdefault(step, projection.skip(step, axis, scale))
+        # Every step needs the store, and the unchanged rerun the full one.
+        if skipped['store.write']:
+            skipped = dict.fromkeys(ETL_STEPS, skipped['store.write'])
+        if skipped['etl.run_job']:
+            skipped['etl.run_job (unchanged)'] = skipped['etl.run_job']
+        if all(skipped.values()):
+            results += [_record('etl', step, label, skipped=skipped[step]) for step in ETL_STEPS]
+            continue
+
+        series = real if label == 'real' else synthetic_store_series(real, scale, axis)
+        shape = {'series': len(series), 'values': int(sum(map(len, series.values())))}
+        tmp = tempfile.mkdtemp(prefix='housing-bench-')
+        store_dir, cleaned_dir = os.path.join(tmp, 'store'), os.path.join(tmp, 'cleaned')
+        os.makedirs(cleaned_dir)
+        jobs = [etl.Job('%s.csv' % sid, [sid]) for sid in series]
+        states = []
+
+        def full():
+            return [etl.run_job(job, None, True, store_dir, cleaned_dir) for job in jobs]
+
+        def unchanged():
+            return [etl.run_job(job, st[0], False, store_dir, cleaned_dir) for job, st in zip(jobs, states)]
+
+        def aligned():
+            handle = store.open_store(store_dir, rebuild=False)
+            return align.align({sid: handle.series(sid) for sid in series}, freq='ME', fill='interpolate')
+
+        steps = {
+            'store.write': lambda: store.write(series, store_dir),
+            'etl.run_job': full,
+            'etl.run_job (unchanged)': unchanged,
+            'align': aligned,
+        }
+        try:
+            for step, fn in steps.items():
+                if skipped[step]:
+                    results.append(_record('etl', step, label, skipped=skipped[step], **shape))
+                    continue
+                seconds, median, peak, out = measure(fn, repeat)
+                if step == 'store.write':
+                    store._opened.pop(store_dir, None)
+                elif step == 'etl.run_job':
+                    states = out
+                projection.add(step, axis, scale, seconds)
+                results.append(_record('etl', step, label, seconds, median, peak, **shape))
+        finally:
+            store._opened.pop(store_dir, None)
+            shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+# --- analysis --------------------------------------------------------------
+
+MiB = 2 ** 20
+
+
+def _subset_count(p, max_size):
+    return sum(comb(p, k) for k in range(1, max_size + 1))
+
+
+def _analysis_steps(bootstrap_size):
+    """name -> (base frame, footprint MiB(n, p), work(n, p), function(df))."""
+    def lag(n):
+        return min(36, n // 3)
+
+    def nfft(n):
+        return 1 << int(np.ceil(np.log2(n + lag(n))))
+
+    def subsets_size(p):
+        # The app searches every subset of its 10 factors; beyond that keep
+        # the search to small subsets so the count axis stays tractable.
+        return p if p <= 16 else 2
+
+    def ols_footprint(n, p):
+        if n <= p + 1:
+            return 'fewer rows than coefficients'
+        return n * p * 8 * 4 / MiB
+
+    return {
+        'corr': ('annual', lambda n, p: (n * p + p * p) * 8 * 3 / MiB,
+                 lambda n, p: n * p * p, lambda df: df.corr()),
+        'rolling_corr': ('monthly', lambda n, p: n * p * 8 * 12 / MiB,
+                         lambda n, p: n * p, lambda df: correlation.rolling_corr(df, window=60)),
+        'lagged_corr': ('monthly', lambda n, p: (nfft(n) // 2 + 1) * p * p * 16 * 2 / MiB,
+                        lambda n, p: nfft(n) * p * p,
+                        lambda df: correlation.lagged_corr(df, max_lag=lag(len(df)))),
+        'correlation_ci': ('annual', lambda n, p: bootstrap_size * n * p * 8 * 4 / MiB,
+                           lambda n, p: bootstrap_size * n * p,
+                           lambda df: bootstrap.correlation_ci(df, size=bootstrap_size)),
+        'ols': ('annual', ols_footprint, lambda n, p: n * p * p,
+                lambda df: regression.ols(df, [c for c in df.columns if c != regression.TARGET])),
+        # Each subset is one sweep of the (p + 1)-square Gram matrix.
+        'best_subsets': ('annual', lambda n, p: _subset_count(p - 1, subsets_size(p - 1)) * 200 / MiB,
+                         lambda n, p: _subset_count(p - 1, subsets_size(p - 1)) * p * p,
+                         lambda df: regression.best_subsets(df, max_size=subsets_size(df.shape[1] - 1))),
+    }
+
+
+def bench_analysis(scales=SCALES, axes=AXES, repeat=3, max_mb=2048, max_seconds=300, bootstrap_size=1000):
+    bases = {
+        'annual': align.build_combined(),
+        'monthly': align.build_combined('ME', start='1987', fill='interpolate'),
+    }
+    projection = Projection(max_seconds)
+    results = []
+    for step, (base, footprint, work, fn) in _analysis_steps(bootstrap_size).items():
+        real = bases[base]
+        for label, rows, cols in _shapes((len(real), real.shape[1] - 1), scales, axes):
+            axis = None if label == 'real' else label.split()[0]
+            est = footprint(rows, cols + 1)
+            if isinstance(est, str):
+                reason = est
+            elif est > max_mb:
+                reason = 'estimated footprint over %d MB' % max_mb
+            else:
+                reason = projection.skip(step, axis, work(rows, cols + 1))
+            if reason:
+                results.append(_record('analysis', step, label, skipped=reason, rows=rows, cols=cols))
+                continue
+            df = real if label == 'real' else synthetic_frame(rows, cols)
+            seconds, median, peak, _ = measure(lambda: fn(df), repeat)
+            projection.add(step, axis, work(rows, cols + 1), seconds)
+            results.append(_record('analysis', step, label, seconds, median, peak, rows=rows, cols=cols))
+    return results
+
+
+# --- results ---------------------------------------------------------------
+
+def _meta():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def save(results, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    meta = _meta()
+    path = os.path.join(results_dir, meta['time'].replace(':', '').replace('+0000', 'Z') + '.json')
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=1)
+    return path
+
+
+def history(results_dir=RESULTS_DIR):
+    """Saved runs, oldest first."""
+    return sorted(glob.glob(os.path.join(results_dir, '*.json')))
+
+
+def compare(results, baseline_path):
+    """Current vs. a saved run: one row per (group, step, data) timed in both."""
+    with open(baseline_path) as f:
+        baseline = {(r['group'], r['step'], r['data']): r for r in json.load(f)['results']}
+    rows = []
+    for r in results:
+        b = baseline.get((r['group'], r['step'], r['data']))
+        if b is None or 'seconds' not in r or 'seconds' not in b:
+            continue
+        rows.append((r['group'], r['step'], r['data'], b['seconds'], r['seconds'],
+                     r['seconds'] / b['seconds'] if b['seconds'] else np.nan))
+    return pd.DataFrame(rows, columns=['group', 'step', 'data', 'baseline s', 'current s', 'ratio'])
+
+
+def report(results):
+    df = pd.DataFrame(results)
+    cols = [c for c in ('group', 'step', 'data', 'rows', 'cols', 'series', 'values',
+                        'seconds', 'median', 'peak_mb', 'skipped') if c in df]
+    return df[cols].to_string(index=False)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the app sections and the analysis pipeline.')
+    parser.add_argument('groups', nargs='*', default=['app', 'etl', 'analysis'],
+                        choices=['app', 'etl', 'analysis'])
+    parser.add_argument('--scales', type=int, nargs='*', default=list(SCALES),
+                        help='synthetic scale factors (default: 10 100 1000)')
+    parser.add_argument('--axes', nargs='*', default=list(AXES), choices=AXES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-mb', type=float, default=2048,
+                        help='skip steps estimated to need more memory than this')
+    parser.add_argument('--max-seconds', type=float, default=300,
+                        help='skip scaled steps projected to take longer than this')
+    parser.add_argument('--baseline', default=None, help='saved run to compare with (default: the latest)')
+    parser.add_argument('--no-save', action='store_true')
+    opts = parser.parse_args()
+
+    previous = history()
+    results = []
+    if 'app' in opts.groups:
+        results += bench_app()
+    if 'etl' in opts.groups:
+        results += bench_etl(opts.scales, opts.axes, opts.repeat, opts.max_mb, opts.max_seconds)
+    if 'analysis' in opts.groups:
+        results += bench_analysis(opts.scales, opts.axes, opts.repeat, opts.max_mb, opts.max_seconds)
+    print(report(results))
+
+    baseline = opts.baseline or (previous[-1] if previous else None)
+    if baseline:
+        print('\nCompared with %s:' % os.path.relpath(baseline, ROOT))
+        print(compare(results, baseline).to_string(index=False, float_format='%.4f'))
+    if not opts.no_save:
+        print('\nSaved %s' % os.path.relpath(save(results), ROOT))
+    if any(r.get('errors') for r in results):
+        sys.exit(1)
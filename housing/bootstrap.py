@@ -0,0 +1,95 @@
+# Moving-block bootstrap confidence intervals for the correlation and
+# regression tables.
+#
+# The combined data has ~20 annual rows, so point estimates alone say little.
+# Resampling contiguous blocks keeps the serial dependence of the yearly
+# series. All resamples are drawn as one (B, n) index array and every
+# statistic is computed for the whole batch with array operations; ``workers``
+# optionally splits the batch across processes.
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from housing.regression import unit_norm
+
+TARGET = 'CSUSHPISA'
+
+
+def block_indices(n, block, size, rng):
+    """(size, n) row indices of ``size`` moving-block resamples of n rows."""
+    block = max(1, min(block, n))
+    nblocks = -(-n // block)
+    starts = rng.integers(0, n - block + 1, size=(size, nblocks))
+    idx = starts[:, :, None] + np.arange(block)
+    return idx.reshape(size, nblocks * block)[:, :n]
+
+
+def batch_corr(X, y):
+    """Correlation of y with each column of X for a batch: (B, n, p), (B, n) -> (B, p)."""
+    Xc = X - X.mean(axis=1, keepdims=True)
+    yc = y - y.mean(axis=1, keepdims=True)
+    num = np.einsum('bnp,bn->bp', Xc, yc)
+    den = np.sqrt(np.einsum('bnp,bnp->bp', Xc, Xc) * np.einsum('bn,bn->b', yc, yc)[:, None])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return num / den
+
+
+def batch_ols(X, y):
+    """OLS coefficients (const first) for a batch: (B, n, k), (B, n) -> (B, k + 1)."""
+    Xb = np.concatenate([np.ones(X.shape[:2] + (1,)), X], axis=2)
+    # pinv copes with resamples that happen to make a column constant.
+    Xs, norms = unit_norm(Xb)
+    xtx = np.einsum('bnk,bnj->bkj', Xs, Xs)
+    xty = np.einsum('bnk,bn->bk', Xs, y)
+    beta = np.einsum('bkj,bj->bk', np.linalg.pinv(xtx), xty)
+    return beta / norms[:, 0, :]
+
+
+def _draw(stat, X, y, block, size, seed):
+    rng = np.random.default_rng(seed)
+    idx = block_indices(len(y), block, size, rng)
+    return stat(X[idx], y[idx])
+
+
+def bootstrap(stat, X, y, block=3, size=5000, seed=0, workers=None):
+    """Stack of ``stat`` over ``size`` block resamples of the rows of X, y."""
+    if not workers or workers == 1:
+        return _draw(stat, X, y, block, size, seed)
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    sizes = [size // workers + (i < size % workers) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(_draw, [stat] * workers, [X] * workers, [y] * workers,
+                         [block] * workers, sizes, seeds)
+        return np.concatenate(list(parts))
+
+
+def _interval(samples, alpha):
+    lo, hi = np.nanpercentile(samples, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+    return lo, hi
+
+
+def correlation_ci(df, target=TARGET, block=3, size=5000, alpha=0.05, seed=0, workers=None):
+    """Correlation of every column with ``target`` plus a bootstrap interval."""
+    factors = [c for c in df.columns if c != target]
+    data = df[factors + [target]].dropna()
+    X = data[factors].to_numpy(dtype='float64')
+    y = data[target].to_numpy(dtype='float64')
+    samples = bootstrap(batch_corr, X, y, block, size, seed, workers)
+    lo, hi = _interval(samples, alpha)
+    point = batch_corr(X[None], y[None])[0]
+    pct = int(round(100 * (1 - alpha)))
+    return pd.DataFrame({target: point, 'CI %d%% low' % pct: lo, 'CI %d%% high' % pct: hi}, index=factors)
+
+
+def coefficient_ci(df, factors, target=TARGET, block=3, size=5000, alpha=0.05, seed=0, workers=None):
+    """OLS coefficients of ``target ~ const + factors`` with bootstrap intervals."""
+    factors = list(factors)
+    data = df[factors + [target]].dropna()
+    X = data[factors].to_numpy(dtype='float64')
+    y = data[target].to_numpy(dtype='float64')
+    samples = bootstrap(batch_ols, X, y, block, size, seed, workers)
+    lo, hi = _interval(samples, alpha)
+    pct = int(round(100 * (1 - alpha)))
+    return pd.DataFrame({'CI %d%% low' % pct: lo, 'CI %d%% high' % pct: hi}, index=['const'] + factors)
@@ -0,0 +1,183 @@
+# Change-point (regime) detection over the raw series.
+#
+# Each series in the columnar store is segmented where its period-over-period
+# change shifts in mean or in variance: a turn in the trend of a price index,
+# a jump in the volatility of rates. PELT (Killick, Fearnhead & Eckley, 2012)
+# finds the exactly optimal segmentation under a penalized Gaussian cost; the
+# cost of any segment comes from two running sums, and candidates that can
+# never again start the last segment are pruned, which keeps the search
+# close to linear in the series length.
+#
+# `python -m housing.changepoints` segments every series, one process per
+# series, and saves the break dates next to the store keyed on its version;
+# the app reads them and rebuilds only when the store has changed.
+
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from housing.store import DATE_DTYPE, STORE_DIR, atomic_write, open_store
+
+# Shortest regime, in years of observations.
+MIN_YEARS = 1
+
+
+def _path(store_dir):
+    return os.path.join(store_dir, 'changepoints.json')
+
+
+def pelt(x, penalty=None, min_size=2, floor=1e-3):
+    """Positions where a new segment of ``x`` starts (change in mean and variance).
+
+    ``penalty`` is the cost of a break, 3 log n by default (the modified BIC
+    for a change in mean and variance). Segments are at least ``min_size``
+    long; ``floor`` is added to the variance of the standardized data within
+    a segment, so a run of identical values does not have minus infinite
+    cost. (Added rather than clamped: splitting a segment then never raises
+    its cost, which the pruning relies on.)
+    """
+    x = np.asarray(x, dtype='float64')
+    n = len(x)
+    if n < 2 * min_size:
+        return np.array([], dtype=np.int64)
+    z = (x - x.mean()) / (x.std() or 1.0)
+    S1 = np.concatenate([[0.0], np.cumsum(z)])
+    S2 = np.concatenate([[0.0], np.cumsum(z * z)])
+    penalty = 3 * np.log(n) if penalty is None else penalty
+
+    # F[t]: optimal cost of x[:t]; last[t]: where its last segment starts.
+    F = np.full(n + 1, np.inf)
+    F[0] = -penalty
+    last = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.empty(0, dtype=np.int64)
+    # Time -> starts to drop from then on (see below).
+    pruned = {}
+    for t in range(min_size, n + 1):
+        if t in pruned:
+            candidates = np.setdiff1d(candidates, pruned.pop(t), assume_unique=True)
+        s = t - min_size
+        if s == 0 or s >= min_size:
+            candidates = np.append(candidates, s)
+        m = t - candidates
+        mean = (S1[t] - S1[candidates]) / m
+        var = np.maximum((S2[t] - S2[candidates]) / m - mean * mean, 0.0) + floor
+        cost = F[candidates] + m * np.log(var)
+        best = np.argmin(cost)
+        F[t] = cost[best] + penalty
+        last[t] = candidates[best]
+        # A start that cannot beat the optimum at t never will once t itself
+        # can start the last segment (the cost only drops over a split), so
+        # it is dropped for good min_size steps later.
+        pruned[t + min_size] = candidates[cost > F[t]]
+
+    breaks = []
+    t = last[n]
+    while t > 0:
+        breaks.append(t)
+        t = last[t]
+    return np.array(breaks[::-1], dtype=np.int64)
+
+
+def per_year(dates):
+    """Typical number of observations per year of sorted datetime64 ``dates``."""
+    if len(dates) < 2:
+        return 1.0
+    days = np.median(np.diff(dates).astype('timedelta64[s]').astype(np.int64)) / 86400
+    return 365.25 / max(days, 1.0)
+
+
+def detect(dates, values, min_years=MIN_YEARS, penalty=None):
+    """Dates at which a new regime of the series starts."""
+    dates, values = np.asarray(dates), np.asarray(values, dtype='float64')
+    keep = ~np.isnan(values)
+    dates, values = dates[keep], values[keep]
+    min_size = max(2, int(round(min_years * per_year(dates))))
+    # Break i of the differences is the change from dates[i] to dates[i + 1].
+    return dates[pelt(np.diff(values), penalty, min_size) + 1].astype(DATE_DTYPE)
+
+
+def _detect_series(store_dir, sid, min_years, penalty):
+    return detect(*open_store(store_dir, rebuild=False).arrays(sid), min_years, penalty)
+
+
+def build(store_dir=STORE_DIR, workers=None, min_years=MIN_YEARS, penalty=None):
+    """Segment every store series and save the break dates."""
+    store = open_store(store_dir)
+    sids = store.names()
+    args = [(store_dir, sid, min_years, penalty) for sid in sids]
+    if workers == 1:
+        results = [_detect_series(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_detect_series, *a) for a in args]
+            results = [f.result() for f in futures]
+    atomic_write(_path(store_dir), lambda f: json.dump(
+        {'store_version': store.version(), 'min_years': min_years,
+         'series': {sid: [str(d) for d in breaks] for sid, breaks in zip(sids, results)}}, f), 'w')
+
+
+_opened = {}
+# Serializes re-detection and the cache between the sessions of one process.
+_lock = threading.Lock()
+
+
+def open_changepoints(store_dir=STORE_DIR, workers=1):
+    """sid -> datetime64 break dates, re-detected whenever the store has changed."""
+    version = open_store(store_dir).version()
+    with _lock:
+        cached = _opened.get(store_dir)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        path = _path(store_dir)
+        meta = None
+        if os.path.exists(path):
+            with open(path) as f:
+                meta = json.load(f)
+        if meta is None or meta.get('store_version') != version:
+            build(store_dir, workers)
+            with open(path) as f:
+                meta = json.load(f)
+        breaks = {sid: np.array(dates, dtype=DATE_DTYPE) for sid, dates in meta['series'].items()}
+        _opened[store_dir] = (version, breaks)
+        return breaks
+
+
+def regimes(index, breaks):
+    """Regime number (0 before the first break) of every timestamp in ``index``."""
+    return np.searchsorted(np.asarray(breaks, dtype=DATE_DTYPE), index.values.astype(DATE_DTYPE), 'right')
+
+
+def by_regime(df, breaks, fn, min_rows=2):
+    """``fn`` applied to the rows of ``df`` in each regime.
+
+    Returns {'YYYY-MM to YYYY-MM': result}, in time order; regimes with
+    fewer than ``min_rows`` rows in ``df`` are skipped.
+    """
+    labels = regimes(df.index, breaks)
+    out = {}
+    for label in np.unique(labels):
+        part = df[labels == label]
+        if len(part) >= min_rows:
+            name = '%s to %s' % (part.index[0].strftime('%Y-%m'), part.index[-1].strftime('%Y-%m'))
+            out[name] = fn(part)
+    return out
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Detect regime changes in every raw series.')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: one per core)')
+    parser.add_argument('--min-years', type=float, default=MIN_YEARS)
+    opts = parser.parse_args()
+
+    start = time.perf_counter()
+    build(workers=opts.jobs, min_years=opts.min_years)
+    elapsed = time.perf_counter() - start
+    for sid, breaks in sorted(open_changepoints().items()):
+        print('  %-14s %s' % (sid, ', '.join(str(d)[:7] for d in breaks) or '-'))
+    print('Segmented in %.2f s' % elapsed)
@@ -0,0 +1,131 @@
+# Plotly figure builders shared by the app sections.
+#
+# Plotly is imported inside the builders, as in housing/figures.py: sections
+# served from the prebuilt figure bundle never build a figure, and should not
+# pay for importing plotly.express at cold start. Loading the bundle needs
+# only plotly.io.
+
+import numpy as np
+
+# Range buttons every factor chart has carried since the first version.
+RANGE_BUTTONS = [
+    dict(count=6, label="6m", step="month", stepmode="backward"),
+    dict(count=1, label="YTD", step="year", stepmode="todate"),
+    dict(count=1, label="1y", step="year", stepmode="backward"),
+    dict(step="all"),
+]
+
+
+def time_series(df, x, y=None):
+    """Line chart with the range slider and range selector buttons."""
+    import plotly.express as px
+
+    fig = px.line(df, x=x, y=df.columns if y is None else y)
+    fig.update_xaxes(rangeslider_visible=True, rangeselector=dict(buttons=RANGE_BUTTONS))
+    return fig
+
+
+def _year_fraction(day):
+    year = day.astype('datetime64[Y]')
+    days = (day - year.astype('datetime64[D]')).astype(int)
+    return 1970 + year.astype(int) + days / 365.25
+
+
+def annotate(fig, events, years=False):
+    """Shade the days each of ``events`` (housing/events.py) covers, labelled
+    with its headline. ``years`` is for charts whose x axis is a plain year
+    number rather than a date."""
+    for event in events:
+        start, end = event.start, event.end + 1
+        if years:
+            start, end = _year_fraction(start), _year_fraction(end)
+        else:
+            start, end = str(start), str(end)
+        fig.add_vrect(x0=start, x1=end, fillcolor='gray', opacity=0.15, line_width=0,
+                      annotation=dict(text=event.headline, textangle=-90, font_size=10),
+                      annotation_position='top left')
+    return fig
+
+
+def mark_breaks(fig, dates):
+    """Dashed vertical lines at detected regime changes (housing/changepoints.py)."""
+    for date in dates:
+        fig.add_vline(x=str(date), line_dash='dash', line_width=1, line_color='gray')
+    return fig
+
+
+def history(series, events=(), breaks=()):
+    """Line chart of several series on their own dates.
+
+    ``series`` maps a name to ``(dates, values)``, or to ``(dates, values,
+    low, high)`` to also shade the low-high range around the line.
+    ``events`` are shaded behind the lines (see annotate()) and ``breaks``
+    marked with dashed lines (see mark_breaks()).
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    for i, (name, data) in enumerate(series.items()):
+        color = colors[i % len(colors)]
+        if len(data) == 4:
+            dates, _, low, high = data
+            r, g, b = (int(color[k:k + 2], 16) for k in (1, 3, 5))
+            fig.add_trace(go.Scatter(x=dates, y=high, mode='lines', line=dict(width=0),
+                                     showlegend=False, hoverinfo='skip'))
+            fig.add_trace(go.Scatter(x=dates, y=low, mode='lines', line=dict(width=0), fill='tonexty',
+                                     fillcolor='rgba(%d,%d,%d,0.2)' % (r, g, b),
+                                     showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=data[0], y=data[1], name=name, mode='lines', line=dict(color=color)))
+    fig.update_xaxes(rangeslider_visible=True, rangeselector=dict(buttons=RANGE_BUTTONS))
+    fig.update_layout(showlegend=len(series) > 1, legend=dict(orientation='h', y=1.1))
+    return mark_breaks(annotate(fig, events), breaks)
+
+
+def correlation_heatmap(corr, title=None):
+    """Lower-triangle correlation heatmap, the Plotly version of the seaborn
+    diverging heatmap 3.ipynb used (upper triangle masked, centred on 0)."""
+    import plotly.graph_objects as go
+
+    values = corr.to_numpy(dtype='float64', copy=True)
+    values[np.triu(np.ones_like(values, dtype=bool))] = np.nan
+    fig = go.Figure(go.Heatmap(
+        z=values,
+        x=list(corr.columns),
+        y=list(corr.index),
+        zmin=-1, zmax=1, zmid=0,
+        colorscale='RdBu_r',
+        hoverongaps=False,
+        hovertemplate='%{y} / %{x}: %{z:.2f}<extra></extra>',
+        colorbar=dict(thickness=12, len=0.6),
+    ))
+    fig.update_layout(
+        title=title,
+        yaxis=dict(autorange='reversed', scaleanchor='x'),
+        xaxis=dict(tickangle=45),
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=10, r=10, t=40 if title else 10, b=10),
+    )
+    return fig
+
+
+def prediction_band(x, predicted, x_label, y_label='Predicted index', current=None):
+    """Prediction line over ``x`` with its interval shaded.
+
+    ``predicted`` has prediction/lower/upper columns (scenario.Predictor);
+    ``current`` marks one x value with a vertical line.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=predicted['upper'], mode='lines', line=dict(width=0),
+                             showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=x, y=predicted['lower'], mode='lines', line=dict(width=0), fill='tonexty',
+                             fillcolor='rgba(99,110,250,0.2)', name='Prediction interval'))
+    fig.add_trace(go.Scatter(x=x, y=predicted['prediction'], mode='lines', line=dict(color='#636efa'),
+                             name='Prediction'))
+    if current is not None:
+        fig.add_vline(x=current, line_dash='dot', line_color='gray')
+    fig.update_layout(xaxis_title=x_label, yaxis_title=y_label, legend=dict(orientation='h', y=1.1))
+    return fig
@@ -0,0 +1,158 @@
+# Correlation analysis beyond the single static df.corr() table.
+
+import numpy as np
+import pandas as pd
+
+TARGET = 'CSUSHPISA'
+
+
+def _window_sums(a, window):
+    """Sum of every length-``window`` trailing window of ``a`` along axis 0."""
+    c = np.cumsum(a, axis=0)
+    out = c.copy()
+    out[window:] = c[window:] - c[:-window]
+    return out
+
+
+def rolling_corr(df, target=TARGET, window=20, min_periods=None):
+    """Trailing-window Pearson correlation of ``target`` with every other column.
+
+    All columns are handled at once from running sums of x, y, x^2, y^2 and
+    xy, so the cost is O(n) per factor regardless of ``window`` (no per-window
+    corr()). Observations missing in either series are left out of that
+    pair's window; windows with fewer than ``min_periods`` pairs are NaN.
+    """
+    min_periods = window if min_periods is None else min_periods
+    factors = [c for c in df.columns if c != target]
+    X = df[factors].to_numpy(dtype='float64')
+    y = df[target].to_numpy(dtype='float64')[:, None]
+
+    # Correlation is unaffected by shifting and scaling, and standardizing
+    # first keeps the running sums of squares from losing precision on
+    # series as large as population.
+    X = (X - np.nanmean(X, axis=0)) / np.nanstd(X, axis=0)
+    y = (y - np.nanmean(y)) / np.nanstd(y)
+
+    valid = ~np.isnan(X) & ~np.isnan(y)
+    Xv = np.where(valid, X, 0.0)
+    yv = np.where(valid, y, 0.0)
+
+    n = _window_sums(valid.astype('float64'), window)
+    sx = _window_sums(Xv, window)
+    sy = _window_sums(yv, window)
+    sxx = _window_sums(Xv * Xv, window)
+    syy = _window_sums(yv * yv, window)
+    sxy = _window_sums(Xv * yv, window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        r = cov / np.sqrt(var)
+    r[(n < max(min_periods, 2)) | ~(var > 0)] = np.nan
+    return pd.DataFrame(np.clip(r, -1.0, 1.0), index=df.index, columns=factors)
+
+
+def lagged_corr(df, max_lag=36, min_periods=12):
+    """Cross-correlation cube of every column pair over lags 0..max_lag.
+
+    ``cube[i, j, k]`` is the Pearson correlation of column i at time t with
+    column j at time t + k, i.e. how well i *leads* j by k periods (read
+    ``cube[j, i, k]`` for i lagging j). Each pair and lag only uses the
+    periods where both series are observed.
+
+    Every sum the correlation needs (pair counts, sums, sums of squares and
+    cross products) is a cross-correlation, and all of them for all pairs and
+    lags come from three batched FFTs of the (n, p) data, mask and squared
+    data, so the whole p x p x (max_lag + 1) cube is one vectorized pass.
+    """
+    X = df.to_numpy(dtype='float64')
+    n, p = X.shape
+    X = (X - np.nanmean(X, axis=0)) / np.nanstd(X, axis=0)
+    mask = ~np.isnan(X)
+    X = np.where(mask, X, 0.0)
+    M = mask.astype('float64')
+
+    nfft = 1 << int(np.ceil(np.log2(n + max_lag)))
+    FX = np.fft.rfft(X, nfft, axis=0)
+    FM = np.fft.rfft(M, nfft, axis=0)
+    FX2 = np.fft.rfft(X * X, nfft, axis=0)
+
+    def xcorr(A, B):
+        # sum_t a_i[t] * b_j[t + k] for all i, j and k = 0..max_lag
+        out = np.fft.irfft(np.conj(A)[:, :, None] * B[:, None, :], nfft, axis=0)
+        return np.moveaxis(out[:max_lag + 1], 0, -1)
+
+    cnt = np.rint(xcorr(FM, FM))
+    sx, sy = xcorr(FX, FM), xcorr(FM, FX)
+    sxx, syy = xcorr(FX2, FM), xcorr(FM, FX2)
+    sxy = xcorr(FX, FX)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (cnt * sxx - sx * sx) * (cnt * syy - sy * sy)
+        r = (cnt * sxy - sx * sy) / np.sqrt(var)
+    r[(cnt < max(min_periods, 2)) | ~(var > 1e-9)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def peak_lags(cube, columns, target=TARGET):
+    """Per column, the lead (in periods) at which it best tracks ``target``."""
+    columns = list(columns)
+    t = columns.index(target)
+    rows = []
+    for i, name in enumerate(columns):
+        if i == t:
+            continue
+        leads = cube[i, t]
+        if np.all(np.isnan(leads)):
+            rows.append((name, np.nan, np.nan, np.nan))
+            continue
+        k = int(np.nanargmax(np.abs(leads)))
+        rows.append((name, k, leads[k], leads[0]))
+    out = pd.DataFrame(rows, columns=['Factor', 'Peak lead', 'Correlation at peak', 'Correlation at lag 0'])
+    return out.set_index('Factor')
+
+
+def partial_correlations(df, target=TARGET, tol=1e-10):
+    """Partial correlation matrix and variance inflation factors from one inverse.
+
+    With P the inverse (precision matrix) of the correlation matrix of all
+    columns, the correlation of i and j with every other column held fixed
+    is -P[i, j] / sqrt(P[i, i] P[j, j]). The factors' VIFs are the diagonal
+    of the inverse of their own correlation matrix, which is P with
+    ``target`` removed by a rank-one Schur complement rather than another
+    inversion (or one auxiliary regression per factor).
+
+    Rows with any missing value are dropped so that the correlation matrix
+    is consistent. Directions with an eigenvalue below ``tol`` times the
+    largest are exact collinearity: columns involved in them get an infinite
+    VIF and NaN partial correlations. Returns (partial correlations, VIF).
+    """
+    data = df.drop(columns=['DATE'], errors='ignore').dropna()
+    Z = data.to_numpy(dtype='float64')
+    Z = Z - Z.mean(axis=0)
+    norms = np.sqrt((Z ** 2).sum(axis=0))
+    keep = norms > 0
+    columns = data.columns[keep]
+    Z = Z[:, keep] / norms[keep]
+    R = Z.T @ Z
+
+    w, V = np.linalg.eigh(R)
+    ok = w > tol * w[-1]
+    P = (V[:, ok] / w[ok]) @ V[:, ok].T
+    collinear = (V[:, ~ok] ** 2).sum(axis=1) > 1e-8
+
+    d = np.sqrt(np.diag(P))
+    partial = -P / np.outer(d, d)
+    np.fill_diagonal(partial, 1.0)
+    partial[collinear, :] = np.nan
+    partial[:, collinear] = np.nan
+    partial = pd.DataFrame(np.clip(partial, -1.0, 1.0), index=columns, columns=columns)
+
+    factors = [c for c in columns if c != target]
+    f = [columns.get_loc(c) for c in factors]
+    vif = np.diag(P)[f]
+    if target in columns:
+        t = columns.get_loc(target)
+        vif = vif - P[f, t] ** 2 / P[t, t]
+    vif = np.where(collinear[f], np.inf, vif)
+    return partial, pd.Series(vif, index=factors, name='VIF')
@@ -0,0 +1,164 @@
+# Shared data-access layer for main.py.
+#
+# Every dataset the app shows is parsed once per process and shared across all
+# Streamlit sessions. An entry is only re-parsed when the file underneath it
+# actually changes: a changed mtime/size triggers a content hash, and only a
+# changed hash triggers a new parse.
+
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dataset name -> path relative to the repository root.
+DATASETS = {
+    'snp': 'data/cleaned/snp.csv',
+    'population': 'data/cleaned/population_q_cleaned.csv',
+    'household_size': 'data/cleaned/pops.csv',
+    'unemployment': 'data/cleaned/unemp.csv',
+    'income': 'data/cleaned/incomenew.csv',
+    'mortgage': 'data/cleaned/dd.csv',
+    'debt': 'data/cleaned/debt_inc.csv',
+    'permits': 'data/cleaned/permit.csv',
+    'existing_sales': 'data/cleaned/existinghomessold.csv',
+    'foreclosures': 'data/cleaned/foreclosures.csv',
+    'combined': 'finalcombined.csv',
+}
+
+
+def resolve(name):
+    """Return the absolute path of a dataset name or a repo-relative path."""
+    path = DATASETS.get(name, name)
+    if not os.path.isabs(path):
+        path = os.path.join(ROOT, path)
+    return path
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _key(path, kwargs):
+    # Reader arguments may be unhashable (usecols=[...], dtype={...}), so the
+    # key holds their reprs, which are equal exactly when the arguments are.
+    return path, tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+
+
+class _Entry:
+    __slots__ = ('stamp', 'digest', 'value')
+
+    def __init__(self, stamp, digest, value):
+        self.stamp = stamp
+        self.digest = digest
+        self.value = value
+
+
+class DataCache:
+    """Process-wide cache of parsed files, keyed by path.
+
+    The frames handed out are shared between sessions, so callers must treat
+    them as read-only (use ``rename(columns=...)`` rather than
+    ``rename(..., inplace=True)``).
+    """
+
+    def __init__(self, reader=pd.read_csv):
+        self._reader = reader
+        self._entries = {}
+        # _lock guards the dicts and counters; a file is parsed under its own
+        # key lock only, so a slow parse never blocks other datasets.
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        # Path -> (stamp, digest) of files versioned before they were loaded.
+        self._digests = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _current(self, name, kwargs):
+        """(entry, parsed): the up-to-date entry, and whether it was just parsed."""
+        path = resolve(name)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        key = _key(path, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stamp == stamp:
+                return entry, False
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            # Another session may have refreshed it while this one waited.
+            if entry is not None and entry.stamp == stamp:
+                return entry, False
+            digest = file_hash(path)
+            if entry is not None and entry.digest == digest:
+                # Touched but not modified: keep the parsed frame.
+                entry.stamp = stamp
+                return entry, False
+            entry = _Entry(stamp, digest, self._reader(path, **kwargs))
+            with self._lock:
+                self._entries[key] = entry
+                self.misses += 1
+            return entry, True
+
+    def load(self, name, **kwargs):
+        entry, parsed = self._current(name, kwargs)
+        if not parsed:
+            with self._lock:
+                self.hits += 1
+        return entry.value
+
+    def version(self, name, **kwargs):
+        """Content hash of the file behind ``name``, refreshed if it changed.
+
+        The file is hashed but not parsed, and the lookup is not counted as
+        a hit: callers ask for versions on every rerun.
+        """
+        path = resolve(name)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(_key(path, kwargs))
+            if entry is not None and entry.stamp == stamp:
+                return entry.digest
+            known = self._digests.get(path)
+            if known is not None and known[0] == stamp:
+                return known[1]
+        digest = file_hash(path)
+        with self._lock:
+            self._digests[path] = (stamp, digest)
+        return digest
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+cache = DataCache()
+
+
+def load(name, **kwargs):
+    """Load a dataset through the shared cache."""
+    return cache.load(name, **kwargs)
+
+
+def version(name, **kwargs):
+    return cache.version(name, **kwargs)
+
+
+def stats():
+    return cache.stats()
@@ -0,0 +1,107 @@
+# Server-side downsampling of long series for the charts.
+#
+# A chart is only so many pixels wide, so sending every weekly observation
+# since 1971 buys nothing but payload. Both reducers here keep the first and
+# last point and return *indices* into the input, so the caller can slice
+# dates and values (or any other aligned column) alike.
+#
+#   lttb    Largest-Triangle-Three-Buckets (Steinarsson, 2013): one point per
+#           bucket, the one forming the largest triangle with the point kept
+#           in the previous bucket and the mean of the next. Preserves the
+#           visual shape of the line very well.
+#   minmax  the lowest and highest point of every bucket; cheaper, and never
+#           loses an extreme value.
+
+import numpy as np
+
+
+def _edges(start, stop, count):
+    """Boundaries splitting range(start, stop) into ``count`` near-equal buckets."""
+    return np.linspace(start, stop, count + 1).astype(np.int64)
+
+
+def _padded(edges):
+    """(buckets, width) input indices of every bucket and the mask of real ones.
+
+    Short buckets are padded by repeating their last index, so a padded slot
+    always ties with a real one that comes before it and an argmin/argmax
+    over the row never lands on padding.
+    """
+    lo, hi = edges[:-1], edges[1:]
+    idx = lo[:, None] + np.arange(int((hi - lo).max()))
+    valid = idx < hi[:, None]
+    return np.minimum(idx, hi[:, None] - 1), valid
+
+
+def _as_float(a):
+    a = np.asarray(a)
+    if np.issubdtype(a.dtype, np.datetime64):
+        a = a.astype('datetime64[s]').astype(np.int64)
+    return a.astype(np.float64)
+
+
+def lttb(x, y, n):
+    """Indices of the ``n`` points LTTB keeps out of ``(x, y)``.
+
+    ``x`` must be increasing (numbers or datetime64). Bucket boundaries, the
+    padded bucket matrices and each bucket's mean are computed for all
+    buckets at once; only the pick itself walks the buckets, since each
+    depends on the point kept before it, and that is one vectorized
+    expression over a bucket per step.
+    """
+    x, y = _as_float(x), np.asarray(y, dtype=np.float64)
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    idx, valid = _padded(_edges(1, size - 1, n - 2))
+    X, Y = x[idx], y[idx]
+    counts = valid.sum(axis=1)
+    # Mean of the *next* bucket for every bucket; the last one looks ahead
+    # to the final point.
+    cx = np.append((np.where(valid, X, 0.0).sum(axis=1) / counts)[1:], x[-1])
+    cy = np.append((np.where(valid, Y, 0.0).sum(axis=1) / counts)[1:], y[-1])
+
+    picked = np.empty(n, dtype=np.int64)
+    picked[0], picked[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        ax, ay = x[a], y[a]
+        # Twice the area of triangle (a, candidate, next-bucket mean).
+        area = np.abs(Y[i] * (ax - cx[i]) + X[i] * (cy[i] - ay) + (cx[i] * ay - ax * cy[i]))
+        a = idx[i, np.argmax(area)]
+        picked[i + 1] = a
+    return picked
+
+
+def minmax(x, y, n):
+    """Indices of the minimum and maximum of ``n // 2`` buckets (plus the ends)."""
+    y = np.asarray(y, dtype=np.float64)
+    size = len(y)
+    buckets = max((n - 2) // 2, 1)
+    if n >= size or size <= 2:
+        return np.arange(size)
+
+    idx, _ = _padded(_edges(1, size - 1, buckets))
+    rows = np.arange(len(idx))
+    Y = y[idx]
+    lo = idx[rows, np.argmin(Y, axis=1)]
+    hi = idx[rows, np.argmax(Y, axis=1)]
+    return np.unique(np.concatenate([[0], lo, hi, [size - 1]]))
+
+
+METHODS = {'lttb': lttb, 'minmax': minmax}
+
+
+def downsample(x, y, n, method='lttb'):
+    """``(x, y)`` reduced to at most ``n`` points with ``method``.
+
+    Missing values are dropped first; a gap in the raw data is a gap in the
+    line either way.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    keep = ~np.isnan(y)
+    if not keep.all():
+        x, y = x[keep], y[keep]
+    picked = METHODS[method](x, y, n)
+    return x[picked], y[picked]
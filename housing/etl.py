@@ -0,0 +1,185 @@
+# Scriptable version of data/data_cleaning.ipynb.
+#
+# `python -m housing.etl` rebuilds the files under data/cleaned/ from the raw
+# FRED series in the columnar store (housing/store.py). Each job records a
+# per-series high-water mark in data/cleaned/.etl_state.json; when new
+# observations are appended to a raw file only the periods from the first new
+# observation onwards are recomputed and merged into the existing output.
+# Independent jobs run in parallel worker processes.
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from housing.align import period_alias
+from housing.data import ROOT
+from housing.store import STORE_DIR, build, open_store
+
+CLEANED_DIR = os.path.join(ROOT, 'data', 'cleaned')
+STATE_FILE = os.path.join(CLEANED_DIR, '.etl_state.json')
+
+
+class Job:
+    """One cleaned output file: the same steps the notebook applied by hand.
+
+    Each series is resampled to ``freq`` with a mean (or left as-is when
+    ``freq`` is None), the series are joined, the last ``tail`` rows kept,
+    rounded to ``decimals`` and finally multiplied by ``scale``.
+    """
+
+    def __init__(self, output, series, freq='QE', tail=80, decimals=2, scale=None, dtype=None):
+        self.output = output
+        self.series = series
+        self.freq = freq
+        self.tail = tail
+        self.decimals = decimals
+        self.scale = scale
+        self.dtype = dtype
+
+    def __repr__(self):
+        return 'Job(%r)' % self.output
+
+
+JOBS = [
+    Job('snp.csv', ['CSUSHPISA']),
+    Job('unemp.csv', ['UNRATE']),
+    Job('mortgage_cleaned.csv', ['MORTGAGE30US']),
+    Job('population_q_cleaned.csv', ['POPTHM'], scale=1000),
+    Job('debt_q.csv', ['GFDEBTN']),
+    Job('newh.csv', ['HSN1F']),
+    Job('permit.csv', ['PERMIT1', 'HSN1F']),
+    Job('debt_inc.csv', ['MDSP'], freq=None),
+    Job('incomenew.csv', ['MEHOINUSA672N'], freq=None, tail=20, decimals=None, dtype='int64'),
+]
+
+
+def _checksum(dates, values):
+    h = hashlib.sha1()
+    h.update(dates.tobytes())
+    h.update(values.tobytes())
+    return h.hexdigest()
+
+
+def _period_start(ts, freq):
+    if freq is None:
+        return ts
+    return ts.to_period(period_alias(freq)).start_time
+
+
+def _mean(values):
+    # A plain sum over the count, as the notebook's pandas computed it. The
+    # compensated sum of today's resample().mean() differs in the last bit,
+    # enough to round e.g. the 2013 Q4 index to 160.1 instead of 160.11.
+    values = values.to_numpy()
+    values = values[~np.isnan(values)]
+    return values.sum() / len(values) if len(values) else np.nan
+
+
+def _finish(s, job):
+    if job.freq is not None:
+        s = s.resample(job.freq).apply(_mean)
+    if job.decimals is not None:
+        s = s.round(decimals=job.decimals)
+    if job.scale is not None:
+        s = s * job.scale
+    return s
+
+
+def run_job(job, state=None, full=False, store_dir=STORE_DIR, cleaned_dir=CLEANED_DIR):
+    """Refresh one output file. Returns (new_state, changed)."""
+    store = open_store(store_dir, rebuild=False)
+    out_path = os.path.join(cleaned_dir, job.output)
+    state = {} if (full or state is None or not os.path.exists(out_path)) else state
+
+    existing = None
+    if state:
+        existing = pd.read_csv(out_path, index_col=0, parse_dates=True)
+
+    columns, new_state = [], {}
+    for sid in job.series:
+        dates, values = store.arrays(sid)
+        prev = state.get(sid)
+        new_state[sid] = {'rows': len(dates), 'last': str(pd.Timestamp(dates[-1]).date()),
+                          'checksum': _checksum(dates, values)}
+        incremental = (existing is not None and prev is not None and sid in existing
+                       and prev['rows'] <= len(dates)
+                       and _checksum(dates[:prev['rows']], values[:prev['rows']]) == prev['checksum'])
+        if incremental:
+            if prev['rows'] == len(dates):
+                columns.append(existing[sid])
+                continue
+            # Appended observations only touch the period they fall in and
+            # everything after it.
+            cut = _period_start(pd.Timestamp(dates[prev['rows']]), job.freq)
+            fresh = _finish(store.series(sid, start=cut), job)
+            kept = existing[sid][existing.index < cut]
+            columns.append(pd.concat([kept, fresh]))
+        else:
+            columns.append(_finish(store.series(sid), job))
+
+    df = pd.concat(columns, axis=1).tail(job.tail)
+    df.index.name = 'DATE'
+    if job.dtype is not None:
+        df = df.astype(job.dtype)
+    df.columns = job.series
+
+    text = df.to_csv(index=True)
+    changed = True
+    if os.path.exists(out_path):
+        # Compare ignoring line endings: some outputs were saved by hand.
+        with open(out_path) as f:
+            changed = f.read().strip() != text.strip()
+    if changed:
+        tmp = out_path + '.tmp'
+        with open(tmp, 'w', newline='') as f:
+            f.write(text)
+        os.replace(tmp, out_path)
+    return new_state, changed
+
+
+def _load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def run(jobs=None, full=False, workers=None, store_dir=STORE_DIR, cleaned_dir=CLEANED_DIR, raw_dir=None):
+    """Run the pipeline; returns the list of output files that changed."""
+    jobs = JOBS if jobs is None else jobs
+    build(store_dir, raw_dir)
+    state_path = os.path.join(cleaned_dir, os.path.basename(STATE_FILE))
+    state = _load_state(state_path)
+
+    args = [(job, state.get(job.output), full, store_dir, cleaned_dir) for job in jobs]
+    if workers == 1:
+        results = [run_job(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_job, *a) for a in args]
+            results = [f.result() for f in futures]
+
+    changed = []
+    for job, (job_state, job_changed) in zip(jobs, results):
+        state[job.output] = job_state
+        if job_changed:
+            changed.append(job.output)
+    with open(state_path, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    return changed
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Refresh data/cleaned/ from the raw FRED series.')
+    parser.add_argument('--full', action='store_true', help='ignore high-water marks and recompute everything')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: one per core)')
+    opts = parser.parse_args()
+
+    changed = run(full=opts.full, workers=opts.jobs)
+    print('Updated: ' + ', '.join(changed) if changed else 'Nothing to update.')
@@ -0,0 +1,98 @@
+# Interval index over the timeline events in data.json.
+#
+# data.json is in TimelineJS format and used to be handed to the timeline
+# component whole. Here it is parsed once per process (through the same
+# change-checking DataCache as the datasets) into events sorted by start
+# date, each covering the period its date names: "2001" is the whole year,
+# "2001-09" the whole month. Charts ask for the events inside their visible
+# range and the timeline for those in the selected window; both lookups are
+# a pair of binary searches, however many events the catalogue holds.
+
+import json
+import os
+
+import numpy as np
+
+from housing.data import ROOT, DataCache
+
+TIMELINE = os.path.join(ROOT, 'data.json')
+
+
+def _bounds(date):
+    """First and last day of the period a TimelineJS date names."""
+    year, month, day = date['year'], date.get('month'), date.get('day')
+    if day:
+        first = np.datetime64('%04d-%02d-%02d' % (int(year), int(month), int(day)), 'D')
+        return first, first
+    if month:
+        first = np.datetime64('%04d-%02d' % (int(year), int(month)), 'M')
+    else:
+        first = np.datetime64('%04d' % int(year), 'Y')
+    return first.astype('datetime64[D]'), (first + 1).astype('datetime64[D]') - 1
+
+
+class Event:
+    """One timeline event: the days it covers and its TimelineJS entry."""
+
+    def __init__(self, data):
+        self.data = data
+        self.start, self.end = _bounds(data['start_date'])
+        if data.get('end_date'):
+            self.end = max(self.end, _bounds(data['end_date'])[1])
+        self.headline = data.get('text', {}).get('headline', '')
+
+
+class EventIndex:
+    """Events sorted by start date, answering interval-overlap queries."""
+
+    def __init__(self, events, title=None):
+        self.events = sorted(events, key=lambda e: (e.start, e.end))
+        self.title = title
+        self.starts = np.array([e.start for e in self.events], dtype='datetime64[D]')
+        self.ends = np.array([e.end for e in self.events], dtype='datetime64[D]')
+        # Running maximum of the ends: non-decreasing, so it can be searched
+        # too. Every event before the first position reaching ``start`` ended
+        # before it.
+        self._reach = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    @classmethod
+    def read(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls([Event(e) for e in data.get('events', [])], data.get('title'))
+
+    def __len__(self):
+        return len(self.events)
+
+    def overlapping(self, start=None, end=None):
+        """Events covering any day between ``start`` and ``end`` (inclusive)."""
+        lo = 0 if start is None else np.searchsorted(self._reach, np.datetime64(start, 'D'), 'left')
+        hi = len(self.events) if end is None else np.searchsorted(self.starts, np.datetime64(end, 'D'), 'right')
+        if start is None:
+            return self.events[lo:hi]
+        # Everything from lo to hi starts by ``end``; drop what ended before ``start``.
+        keep = np.flatnonzero(self.ends[lo:hi] >= np.datetime64(start, 'D'))
+        return [self.events[lo + i] for i in keep]
+
+    def span(self):
+        """(first day, last day) covered by any event."""
+        return self.starts[0], self._reach[-1]
+
+    def timeline(self, start=None, end=None):
+        """TimelineJS document holding only the events between ``start`` and ``end``."""
+        doc = {'events': [e.data for e in self.overlapping(start, end)]}
+        if self.title:
+            doc['title'] = self.title
+        return doc
+
+
+cache = DataCache(reader=EventIndex.read)
+
+
+def load(path=TIMELINE):
+    """The event index of ``path``; shared across sessions, do not mutate it."""
+    return cache.load(path)
+
+
+def version(path=TIMELINE):
+    return cache.version(path)
@@ -0,0 +1,301 @@
+# Static HTML export of the case study.
+#
+# `python -m housing.export [OUT_DIR]` runs every section in pages.PAGES
+# headlessly through Streamlit's AppTest harness, walks the elements each one
+# produced and writes them out as plain HTML: one page per section, the
+# Plotly charts as embedded JSON drawn by a local copy of plotly.js, the
+# tables, the optimized WebP images (housing/assets.py) and the timeline
+# rendered from data.json. The bundle needs no Python process at all and can
+# be served from any static host or CDN. Widgets are frozen at their
+# defaults; with --live-url, pages that have any link to the live app for
+# the interactive version.
+
+import html
+import json
+import os
+import re
+import shutil
+
+from housing import assets
+from housing import events
+from housing import pages
+from housing.data import ROOT
+
+OUT_DIR = os.path.join(ROOT, 'site')
+WIDGETS = ('radio', 'select_slider', 'selectbox', 'slider', 'multiselect', 'checkbox',
+           'toggle', 'number_input', 'text_input', 'date_input')
+ALERTS = ('info', 'warning', 'error', 'success')
+
+STYLE = '''
+body{margin:0;font-family:"Source Sans Pro",sans-serif;color:#31333f;line-height:1.6;display:flex}
+nav{flex:0 0 240px;background:#f0f2f6;padding:1rem;min-height:100vh;font-size:.9rem}
+nav h4{margin:1rem 0 .3rem;color:#808495;font-size:.8rem;text-transform:uppercase}
+nav a{display:block;padding:.15rem .4rem;color:inherit;text-decoration:none;border-radius:4px}
+nav a.current{background:#e0e3eb;font-weight:600}
+main{flex:1;min-width:0;max-width:1400px;padding:1rem 3rem}
+.row{display:flex;gap:1rem}.col{min-width:0}
+.chart{width:100%;min-height:450px}
+.table{overflow-x:auto;max-height:700px;margin:.5rem 0}
+.table table{border-collapse:collapse;font-size:.85rem}
+.table th,.table td{border:1px solid #e6e9ef;padding:.2rem .5rem;text-align:right;white-space:nowrap}
+.caption,.widget{color:#808495;font-size:.85rem}
+.alert{background:#e8f1fb;border-radius:6px;padding:.75rem 1rem}
+details{border:1px solid #e6e9ef;border-radius:6px;padding:.5rem 1rem;margin:.5rem 0}
+summary{cursor:pointer}
+.timeline{list-style:none;padding:0}
+.timeline li{border-left:3px solid #ff4b4b;padding:0 0 1.5rem 1.5rem}
+.timeline time{font-weight:600;color:#ff4b4b}
+.timeline img{max-width:480px;width:100%;height:auto}
+'''
+
+# Charts are drawn only when scrolled near (or an expander holding them is
+# opened), so a page with many charts becomes interactive immediately.
+SCRIPT = '''
+var seen = new IntersectionObserver(function (entries) {
+  entries.forEach(function (e) {
+    if (!e.isIntersecting) return;
+    seen.unobserve(e.target);
+    var spec = JSON.parse(e.target.nextElementSibling.textContent);
+    Plotly.newPlot(e.target, spec.data, spec.layout, Object.assign({responsive: true}, spec.config));
+  });
+}, {rootMargin: '200px'});
+document.querySelectorAll('.chart').forEach(function (div) { seen.observe(div); });
+'''
+
+
+def page_file(script):
+    return 'index.html' if script == pages.DEFAULT else os.path.splitext(os.path.basename(script))[0] + '.html'
+
+
+def _json_script(text):
+    # JSON cannot end the <script> element it is embedded in.
+    return text.replace('</', '<\\/')
+
+
+def _number(v):
+    return '{:,.2f}'.format(v) if abs(v) >= 1 else '%.4g' % v
+
+
+def _inline(text):
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<![\w*])[*_](\S.*?)[*_](?![\w*])', r'<em>\1</em>', text)
+    text = re.sub(r'`(.+?)`', r'<code>\1</code>', text)
+    return re.sub(r'\[(.+?)\]\((\S+?)\)', r'<a href="\2">\1</a>', text)
+
+
+def markdown(text, allow_html=False):
+    """Markdown as HTML, with the ``markdown`` package if it is installed.
+
+    The fallback covers what the sections use: paragraphs, line breaks,
+    headings, bullet lists and inline emphasis, code and links.
+    """
+    if not allow_html:
+        text = html.escape(text, quote=False)
+    try:
+        import markdown as md
+    except ImportError:
+        md = None
+    if md is not None:
+        return md.markdown(text)
+    out = []
+    for block in re.split(r'\n\s*\n', text.strip()):
+        lines = [line.strip() for line in block.strip().splitlines()]
+        heading = re.match(r'(#{1,6})\s+(.*)', lines[0]) if lines else None
+        if heading and len(lines) == 1:
+            level = len(heading.group(1))
+            out.append('<h%d>%s</h%d>' % (level, _inline(heading.group(2)), level))
+        elif lines and all(re.match(r'[-*+]\s', line) for line in lines):
+            out.append('<ul>%s</ul>' % ''.join('<li>%s</li>' % _inline(line[2:]) for line in lines))
+        elif allow_html and block.lstrip().startswith('<'):
+            out.append(block)
+        elif lines:
+            out.append('<p>%s</p>' % '<br>'.join(_inline(line) for line in lines))
+    return '\n'.join(out)
+
+
+def timeline_html(path=events.TIMELINE):
+    """data.json (TimelineJS format) as a static list of events."""
+    data = events.load(path).timeline()
+    out = []
+    title = data.get('title', {}).get('text', {})
+    if title:
+        out.append('<h3>%s</h3>%s' % (title.get('headline', ''), title.get('text', '')))
+    out.append('<ol class="timeline">')
+    for event in data.get('events', []):
+        start = event.get('start_date', {})
+        date = '-'.join(start[k] for k in ('year', 'month', 'day') if k in start)
+        text = event.get('text', {})
+        media = event.get('media', {})
+        out.append('<li><time>%s</time><h4>%s</h4>%s' % (date, text.get('headline', ''), text.get('text', '')))
+        if media.get('url'):
+            out.append('<figure><img src="%s" alt="" loading="lazy"><figcaption class="caption">%s</figcaption></figure>'
+                       % (html.escape(media['url']), media.get('caption', '')))
+        out.append('</li>')
+    out.append('</ol>')
+    return '\n'.join(out)
+
+
+class _Renderer:
+    """Turns one section's AppTest element tree into HTML."""
+
+    def __init__(self):
+        self.charts = 0
+        self.widgets = 0
+
+    def render(self, node):
+        kind = getattr(node, 'type', None)
+        method = getattr(self, '_' + str(kind), None)
+        if method is not None:
+            return method(node)
+        if kind in WIDGETS:
+            self.widgets += 1
+            return '<p class="widget"><b>%s</b>: %s</p>' % (html.escape(node.label), html.escape(str(node.value)))
+        if kind in ALERTS:
+            return '<div class="alert">%s</div>' % markdown(node.value)
+        return self.children(node)
+
+    def children(self, node):
+        children = getattr(node, 'children', None)
+        if not isinstance(children, dict):
+            return ''
+        return '\n'.join(self.render(child) for child in children.values())
+
+    def _title(self, node):
+        return '<h1>%s</h1>' % html.escape(node.value)
+
+    def _header(self, node):
+        return '<h2>%s</h2>' % html.escape(node.value)
+
+    def _subheader(self, node):
+        return '<h3>%s</h3>' % html.escape(node.value)
+
+    def _markdown(self, node):
+        return markdown(node.value, node.proto.allow_html).replace(assets.STATIC_URL + '/', 'img/')
+
+    def _metric(self, node):
+        delta = ' <span class="caption">%s</span>' % html.escape(node.delta) if node.delta else ''
+        return '<p>%s<br><b style="font-size:2rem">%s</b>%s</p>' % (
+            html.escape(node.label), html.escape(node.value), delta)
+
+    def _caption(self, node):
+        return '<p class="caption">%s</p>' % html.escape(node.value)
+
+    def _dataframe(self, node):
+        table = node.value.to_html(border=0, na_rep='', float_format=_number)
+        return '<div class="table">%s</div>' % table
+
+    def _plotly_chart(self, node):
+        self.charts += 1
+        spec = json.loads(node.proto.spec)
+        spec['config'] = json.loads(node.proto.config or '{}')
+        return '<div class="chart"></div><script type="application/json">%s</script>' % (
+            _json_script(json.dumps(spec, separators=(',', ':'))))
+
+    def _iframe(self, node):
+        srcdoc = node.proto.srcdoc
+        # streamlit_timeline embeds TimelineJS from a CDN; render data.json
+        # itself instead.
+        if 'timeline-embed' in srcdoc:
+            return timeline_html()
+        # components.iframe(url) sets src instead, with srcdoc left empty.
+        attr, value = ('srcdoc', srcdoc) if srcdoc else ('src', node.proto.src)
+        return '<iframe %s="%s" style="width:100%%;height:600px;border:0"></iframe>' % (attr, html.escape(value))
+
+    def _flex_container(self, node):
+        children = list(node.children.values())
+        if children and all(getattr(c, 'type', None) == 'column' for c in children):
+            return '<div class="row">%s</div>' % ''.join(
+                '<div class="col" style="flex:%g">%s</div>' % (c.proto.weight, self.children(c))
+                for c in children)
+        return '<div>%s</div>' % self.children(node)
+
+    def _expander(self, node):
+        return '<details><summary>%s</summary>%s</details>' % (
+            html.escape(node.label), self.children(node))
+
+
+def _nav(current):
+    out = ['<nav>']
+    for group, entries in pages.PAGES.items():
+        out.append('<h4>%s</h4>' % html.escape(group))
+        for script, title in entries:
+            out.append('<a href="%s"%s>%s</a>' % (page_file(script), ' class="current"' if script == current else '',
+                                                  html.escape(title)))
+    out.append('</nav>')
+    return '\n'.join(out)
+
+
+def _document(script, title, body, live=None):
+    banner = ''
+    if live:
+        banner = ('<p class="alert">The controls on this page are fixed at their defaults. '
+                  '<a href="%s">Open the live app</a> to change them.</p>' % html.escape(live))
+    return '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>%s</title>
+<link rel="stylesheet" href="style.css">
+<script src="plotly.min.js" defer></script>
+<script src="charts.js" defer></script>
+</head>
+<body>
+%s
+<main>
+%s
+%s
+</main>
+</body>
+</html>
+''' % (html.escape(title), _nav(script), banner, body)
+
+
+def export(out_dir=OUT_DIR, live_url=None, timeout=300):
+    """Render every section to ``out_dir``; returns [(file, charts, widgets)]."""
+    import plotly.offline
+    from streamlit.testing.v1 import AppTest
+
+    os.makedirs(os.path.join(out_dir, 'img'), exist_ok=True)
+    assets.build()
+    for entry in assets.manifest().values():
+        for variant in entry['variants']:
+            shutil.copy2(os.path.join(assets.IMG_DIR, variant['file']), os.path.join(out_dir, 'img'))
+    with open(os.path.join(out_dir, 'plotly.min.js'), 'w') as f:
+        f.write(plotly.offline.get_plotlyjs())
+    with open(os.path.join(out_dir, 'style.css'), 'w') as f:
+        f.write(STYLE.lstrip())
+    with open(os.path.join(out_dir, 'charts.js'), 'w') as f:
+        f.write(SCRIPT.lstrip())
+
+    at = AppTest.from_file(os.path.join(ROOT, 'main.py'), default_timeout=timeout).run()
+    written = []
+    for entries in pages.PAGES.values():
+        for script, title in entries:
+            at.switch_page(script).run()
+            if at.exception:
+                raise RuntimeError('%s failed: %s' % (script, at.exception[0].value))
+            renderer = _Renderer()
+            body = renderer.render(at.main)
+            live = None
+            if live_url and renderer.widgets:
+                # st.Page serves the default page at the root.
+                path = '' if script == pages.DEFAULT else os.path.splitext(os.path.basename(script))[0]
+                live = '%s/%s' % (live_url.rstrip('/'), path)
+            name = page_file(script)
+            with open(os.path.join(out_dir, name), 'w', encoding='utf-8') as f:
+                f.write(_document(script, title, body, live))
+            written.append((name, renderer.charts, renderer.widgets))
+    return written
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Export the case study as static HTML.')
+    parser.add_argument('out_dir', nargs='?', default=OUT_DIR)
+    parser.add_argument('--live-url', help='URL of the live app, linked from pages with controls')
+    args = parser.parse_args()
+    for name, charts, widgets in export(args.out_dir, args.live_url):
+        print('  %-24s %2d charts%s' % (name, charts, ', %d frozen controls' % widgets if widgets else ''))
+    print('Wrote %s' % args.out_dir)
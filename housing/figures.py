@@ -0,0 +1,137 @@
+# Prebuilt bundle of the factor time-series charts.
+#
+# `python -m housing.figures` builds every chart in FIGURES once and writes
+# the serialized Plotly JSON, tagged with the content hash of the dataset and
+# the timeline events (housing/events.py) it was built from, to
+# data/figures.json. The app loads the bundle once per process and hands out
+# the ready figures, so no pandas or Plotly figure construction happens on
+# the request path. A chart whose dataset or events changed since the bundle
+# was built is rebuilt on first use and kept in memory.
+
+import json
+import os
+import threading
+
+import pandas as pd
+
+from housing import charts
+from housing import data as datasets
+from housing import events
+from housing.data import ROOT
+
+BUNDLE = os.path.join(ROOT, 'data', 'figures.json')
+
+
+class FigureSpec:
+    """A time-series chart of one dataset: x column, column renames, y."""
+
+    def __init__(self, dataset, x='DATE', rename=None, y=None):
+        self.dataset = dataset
+        self.x = x
+        self.rename = rename or {}
+        self.y = y
+
+    def version(self):
+        """Changes with the dataset or with the timeline events drawn on the chart."""
+        return '%s:%s' % (datasets.version(self.dataset), events.version())
+
+    def build(self):
+        df = datasets.load(self.dataset).rename(columns=self.rename)
+        fig = charts.time_series(df, self.x, self.y)
+        x = df[self.x]
+        years = pd.api.types.is_integer_dtype(x)
+        if years:
+            first, last = '%d-01-01' % x.min(), '%d-12-31' % x.max()
+        else:
+            first, last = x.min(), x.max()
+        return charts.annotate(fig, events.load().overlapping(first, last), years=years)
+
+
+FIGURES = {
+    'snp': FigureSpec('snp', rename={'CSUSHPISA': 'Index'}, y='Index'),
+    'population': FigureSpec('population', rename={'POPTHM': 'Population'}),
+    'household_size': FigureSpec('household_size', x='Date',
+                                 rename={'CNP16OV_TTLHH': 'No. of members in a household'}),
+    'unemployment': FigureSpec('unemployment', rename={'UNRATE': 'Unemployment Rate in %'}),
+    'income': FigureSpec('income', rename={'MEHOINUSA672N': 'Median Income'}),
+    'mortgage': FigureSpec('mortgage', rename={'MORTGAGE30US': 'Mortgage Rate',
+                                               'HOUSTCB1FQ_HOUSTOB1FQ': 'New Privately Owned Homes'}),
+    'debt': FigureSpec('debt'),
+    'permits': FigureSpec('permits', rename={'PERMIT1': 'No. of permits issued in thousands',
+                                             'HSN1F': 'No. of one family homes sold in thousands'}),
+    'existing_sales': FigureSpec('existing_sales', x='Year'),
+    'foreclosures': FigureSpec('foreclosures', x='Year'),
+}
+
+
+def build_bundle(path=BUNDLE, names=None):
+    """Build and write the figures; returns the number written."""
+    import plotly.io as pio
+
+    names = list(FIGURES) if names is None else names
+    bundle = {}
+    for name in names:
+        spec = FIGURES[name]
+        bundle[name] = {
+            'version': spec.version(),
+            'figure': pio.to_json(spec.build(), validate=False),
+        }
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(bundle, f, separators=(',', ':'))
+    os.replace(tmp, path)
+    return len(bundle)
+
+
+class FigureCache:
+    """Process-wide figures, seeded from the bundle and checked per version."""
+
+    def __init__(self, path=BUNDLE):
+        self.path = path
+        self._figures = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        import plotly.io as pio
+
+        figures = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                raw = json.load(f)
+            for name, entry in raw.items():
+                figures[name] = (entry['version'], pio.from_json(entry['figure'], skip_invalid=True))
+        return figures
+
+    def get(self, name):
+        spec = FIGURES[name]
+        version = spec.version()
+        with self._lock:
+            if self._figures is None:
+                self._figures = self._load()
+            cached = self._figures.get(name)
+            if cached is not None and cached[0] == version:
+                self.hits += 1
+                return cached[1]
+            fig = spec.build()
+            self._figures[name] = (version, fig)
+            self.misses += 1
+            return fig
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._figures or ())}
+
+
+cache = FigureCache()
+
+
+def get(name):
+    """The figure for ``name``; shared across sessions, do not mutate it."""
+    return cache.get(name)
+
+
+if __name__ == '__main__':
+    print('Wrote %d figures to %s' % (build_bundle(), BUNDLE))
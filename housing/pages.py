@@ -0,0 +1,32 @@
+# The sections of the case study in reading order: group -> [(script, title)].
+# main.py builds the Streamlit navigation from it and housing.export the
+# static pages.
+
+PAGES = {
+    'Overview': [
+        ('sections/introduction.py', 'Introduction'),
+        ('sections/timeline.py', 'Brief Timeline'),
+    ],
+    'The Past 2 Decades - Demand': [
+        ('sections/population.py', 'Population'),
+        ('sections/unemployment.py', 'Unemployment'),
+        ('sections/income.py', 'Income'),
+        ('sections/mortgage.py', 'Mortgage Rate'),
+        ('sections/debt.py', 'Debt'),
+    ],
+    'The Past 2 Decades - Supply': [
+        ('sections/permits.py', 'Permits'),
+        ('sections/existing_sales.py', 'Existing home sales'),
+        ('sections/foreclosures.py', 'Foreclosures'),
+    ],
+    'Most Influencial Factor': [
+        ('sections/correlation.py', 'Correlation Analysis'),
+        ('sections/regression.py', 'Explanatory Regression Analysis'),
+        ('sections/regions.py', 'Regional view'),
+    ],
+    'Wrap-up': [
+        ('sections/conclusion.py', 'Conclusion'),
+        ('sections/bibliography.py', 'Biblography'),
+    ],
+}
+DEFAULT = 'sections/introduction.py'
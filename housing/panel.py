@@ -0,0 +1,159 @@
+# Panel of regional home price indices analysed all at once.
+#
+# Drop FRED downloads of regional indices into data/regional/ (one CSV per
+# series, e.g. the Case-Shiller metro indices SFXRSA.csv, NYXRSA.csv, ... or
+# the FHFA state indices CASTHPI.csv, TXSTHPI.csv, ...). They are aligned
+# onto one calendar and held as a single (periods x regions) array, and the
+# correlation of every region with every factor, or the regression of every
+# region on a set of factors, is computed with a few matrix products over
+# the whole panel instead of a per-region DataFrame loop.
+
+import glob
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from housing.align import align
+from housing.data import ROOT, file_hash
+from housing.regression import f_sf, t_sf2, unit_norm
+from housing.store import read_raw
+
+REGIONAL_DIR = os.path.join(ROOT, 'data', 'regional')
+
+# S&P CoreLogic Case-Shiller metro indices (seasonally adjusted).
+METROS = {
+    'ATXRSA': 'Atlanta', 'BOXRSA': 'Boston', 'CRXRSA': 'Charlotte', 'CHXRSA': 'Chicago',
+    'CEXRSA': 'Cleveland', 'DAXRSA': 'Dallas', 'DNXRSA': 'Denver', 'DEXRSA': 'Detroit',
+    'LVXRSA': 'Las Vegas', 'LXXRSA': 'Los Angeles', 'MIXRSA': 'Miami', 'MNXRSA': 'Minneapolis',
+    'NYXRSA': 'New York', 'PHXRSA': 'Phoenix', 'POXRSA': 'Portland', 'SDXRSA': 'San Diego',
+    'SFXRSA': 'San Francisco', 'SEXRSA': 'Seattle', 'TPXRSA': 'Tampa', 'WDXRSA': 'Washington',
+    'SPCS10RSA': '10-City Composite', 'SPCS20RSA': '20-City Composite',
+}
+# FHFA all-transactions state indices are named <state>STHPI.
+STATE_SERIES = re.compile(r'^([A-Z]{2})STHPI$')
+
+
+def region_name(sid):
+    if sid in METROS:
+        return METROS[sid]
+    m = STATE_SERIES.match(sid)
+    return '%s (state)' % m.group(1) if m else sid
+
+
+def files(directory=REGIONAL_DIR):
+    return sorted(glob.glob(os.path.join(directory, '*.csv')))
+
+
+def version(directory=REGIONAL_DIR):
+    """Hash of every regional file, for keying caches."""
+    h = hashlib.sha1()
+    for path in files(directory):
+        h.update(os.path.basename(path).encode())
+        h.update(file_hash(path).encode())
+    return h.hexdigest()
+
+
+class Panel:
+    """Regions side by side: ``values[t, r]`` is region r in period t."""
+
+    def __init__(self, values, index, regions):
+        self.values = np.asarray(values, dtype='float64')
+        self.index = index
+        self.regions = list(regions)
+
+    @classmethod
+    def load(cls, directory=REGIONAL_DIR, freq='QE', start=None, end=None):
+        """Align every CSV in ``directory`` onto one calendar at ``freq``."""
+        series = {}
+        for path in files(directory):
+            s = read_raw(path)
+            series[os.path.splitext(os.path.basename(path))[0]] = s
+        df = align(series, freq=freq, start=start, end=end)
+        return cls(df.to_numpy(), df.index, df.columns)
+
+    def __len__(self):
+        return len(self.regions)
+
+    def names(self):
+        return [region_name(r) for r in self.regions]
+
+    def frame(self):
+        return pd.DataFrame(self.values, index=self.index, columns=self.regions)
+
+    def _factors(self, factors):
+        return factors.reindex(self.index).to_numpy(dtype='float64')
+
+    def correlations(self, factors, min_periods=8):
+        """(regions x factors) Pearson correlations over each pair's common periods.
+
+        All pairwise-complete sums come from six (T x R)' (T x p) products of
+        the masked panel and factor matrices.
+        """
+        X = self._factors(factors)
+        Y = self.values
+        mx, my = ~np.isnan(X), ~np.isnan(Y)
+        X0, Y0 = np.where(mx, X, 0.0), np.where(my, Y, 0.0)
+        # Standardize first so the sums of squares keep their precision.
+        X0 = np.where(mx, (X0 - np.nanmean(X, axis=0)) / np.nanstd(X, axis=0), 0.0)
+        Y0 = np.where(my, (Y0 - np.nanmean(Y, axis=0)) / np.nanstd(Y, axis=0), 0.0)
+        Mx, My = mx.astype('float64'), my.astype('float64')
+
+        n = My.T @ Mx
+        sx, sy = My.T @ X0, Y0.T @ Mx
+        sxx, syy = My.T @ (X0 * X0), (Y0 * Y0).T @ Mx
+        sxy = Y0.T @ X0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+        r[n < max(min_periods, 2)] = np.nan
+        return pd.DataFrame(np.clip(r, -1.0, 1.0), index=self.regions, columns=factors.columns)
+
+    def regress(self, factors):
+        """OLS of every region on ``const + factors`` in one batched solve.
+
+        Each region uses the periods where it and all factors are observed.
+        Returns a DataFrame with one row per region: R-squared, adjusted
+        R-squared, Prob (F-statistic), observations, then the coefficient and
+        p-value of every term.
+        """
+        X = self._factors(factors)
+        X = np.column_stack([np.ones(len(X)), X])
+        terms = ['const'] + list(factors.columns)
+        Y = self.values
+        rows = ~np.isnan(X).any(axis=1)
+        W = (~np.isnan(Y) & rows[:, None]).astype('float64')
+        X0 = np.where(rows[:, None], X, 0.0)
+        Y0 = np.where(W > 0, Y, 0.0)
+
+        Xs, norms = unit_norm(X0)
+        norms = norms[0]
+        xtx = np.einsum('tr,tk,tj->rkj', W, Xs, Xs)
+        xty = np.einsum('tr,tk,tr->rk', W, Xs, Y0)
+        inv = np.linalg.pinv(xtx)
+        beta = np.einsum('rkj,rj->rk', inv, xty)
+
+        n = W.sum(axis=0)
+        k = X.shape[1] - 1
+        resid = (Y0 - Xs @ beta.T) * W
+        rss = (resid ** 2).sum(axis=0)
+        mean = (Y0 * W).sum(axis=0) / np.where(n > 0, n, 1)
+        tss = (((Y0 - mean) * W) ** 2).sum(axis=0)
+        dof = n - k - 1
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r2 = 1.0 - rss / tss
+            adj = 1.0 - (1.0 - r2) * (n - 1) / dof
+            f_stat = (r2 / k) / ((1.0 - r2) / dof)
+            se = np.sqrt(np.diagonal(inv, axis1=1, axis2=2) * (rss / dof)[:, None])
+            t = beta / se
+        coef = beta / norms
+
+        out = pd.DataFrame({'R-squared': r2, 'Adj. R-squared': adj, 'Observations': n.astype(int)},
+                           index=self.regions)
+        out['Prob (F-statistic)'] = [f_sf(f, k, d) if d > 0 else np.nan for f, d in zip(f_stat, dof)]
+        for i, term in enumerate(terms):
+            out[term] = coef[:, i]
+            out['P>|t| ' + term] = [t_sf2(v, d) if d > 0 else np.nan for v, d in zip(t[:, i], dof)]
+        out.loc[dof <= 0, 'Adj. R-squared'] = np.nan
+        return out
@@ -0,0 +1,278 @@
+# Profiling for the app.
+#
+# Set HOUSING_PROFILE=1 before `streamlit run main.py`, or open the app with
+# ?profile=1, to record for every rerun: the section's render time, what each
+# element sent to the browser cost (bytes, and the time spent producing it),
+# the hits and misses of the data, figure and st.cache_data caches, and
+# process memory. The report is shown in a sidebar panel and written to
+# stderr as one JSON line per rerun. With the env var, first imports are timed
+# too. `python -m housing.profiling` measures what every dependency costs to
+# import in a fresh interpreter, so cold-start regressions show up before
+# they reach a dyno.
+
+import builtins
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+log = logging.getLogger(__name__)
+# Streamlit only configures its own loggers; without a handler of our own the
+# per-rerun reports would be dropped under `streamlit run`.
+if not log.handlers:
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+ENV_VAR = 'HOUSING_PROFILE'
+QUERY_PARAM = 'profile'
+
+# First-import cost per module, in seconds, inclusive of what it pulls in.
+imports = {}
+# Latest render time per section, in seconds.
+sections = {}
+# Reports of the most recent profiled reruns, newest last.
+runs = deque(maxlen=50)
+
+_original_import = builtins.__import__
+
+
+def _truthy(value):
+    return (value or '').lower() not in ('', '0', 'false', 'no')
+
+
+def enabled(query_params=None):
+    """Profiling is on via the env var, or ?profile=1 when given the query params."""
+    if _truthy(os.environ.get(ENV_VAR)):
+        return True
+    return query_params is not None and _truthy(query_params.get(QUERY_PARAM))
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        imports.setdefault(name, time.perf_counter() - start)
+
+
+def install():
+    """Start timing first imports (idempotent)."""
+    if builtins.__import__ is not _timed_import:
+        builtins.__import__ = _timed_import
+
+
+def uninstall():
+    builtins.__import__ = _original_import
+
+
+# --- per-rerun report ------------------------------------------------------
+
+def _rss_mb():
+    """Current resident set size in MiB (Linux), or None."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def cache_stats():
+    """Counters of every cache the app reads through."""
+    from housing import data, figures
+    out = {'data': data.stats(), 'figures': figures.cache.stats(), 'st.cache_data': {}}
+    try:
+        from streamlit.runtime.caching import get_data_cache_stats_provider
+        for stats in get_data_cache_stats_provider().get_stats().values():
+            for stat in stats:
+                out['st.cache_data'][stat.cache_name] = stat.byte_length
+    except Exception:
+        # Internal API: a Streamlit upgrade may move it; the rest still works.
+        pass
+    return out
+
+
+def _cache_delta(before, after):
+    delta = {}
+    for name in ('data', 'figures'):
+        delta[name] = {k: after[name][k] - before[name][k] for k in ('hits', 'misses')}
+    # st.cache_data does not count hits; a function whose stored bytes grew
+    # during the rerun computed a new entry, i.e. missed.
+    delta['st.cache_data'] = {
+        fn: {'bytes': size, 'missed': size > before['st.cache_data'].get(fn, 0)}
+        for fn, size in after['st.cache_data'].items()}
+    return delta
+
+
+class _MessageMeter:
+    """Tallies every message the script sends to the browser, per element type.
+
+    Streamlit enqueues an element as soon as the call producing it returns, so
+    the time since the previous message is the cost of computing that element.
+    """
+
+    def __init__(self):
+        self.elements = {}
+        self.total_bytes = 0
+        self._last = time.perf_counter()
+        self._ctx = self._enqueue = None
+
+    def attach(self):
+        try:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+        except ImportError:
+            return
+        ctx = get_script_run_ctx(suppress_warning=True)
+        if ctx is None:
+            return
+        self._ctx, self._enqueue = ctx, ctx._enqueue
+
+        def enqueue(msg):
+            self.record(msg)
+            return self._enqueue(msg)
+        ctx._enqueue = enqueue
+
+    def detach(self):
+        if self._ctx is not None:
+            self._ctx._enqueue = self._enqueue
+            self._ctx = None
+
+    def record(self, msg):
+        now = time.perf_counter()
+        size = msg.ByteSize()
+        kind = msg.WhichOneof('type')
+        if kind == 'delta':
+            kind = msg.delta.WhichOneof('type')
+            if kind == 'new_element':
+                kind = msg.delta.new_element.WhichOneof('type')
+        entry = self.elements.setdefault(kind, {'count': 0, 'bytes': 0, 'seconds': 0.0})
+        entry['count'] += 1
+        entry['bytes'] += size
+        entry['seconds'] += now - self._last
+        self.total_bytes += size
+        self._last = now
+
+
+@contextmanager
+def section(name, profile=None):
+    """Time one section render; when profiling, build and log its full report.
+
+    ``profile`` defaults to the env var; pass ``enabled(st.query_params)`` to
+    honour ?profile=1 for just that session. Yields the report dict, which
+    is filled in when the block exits.
+    """
+    on = enabled() if profile is None else profile
+    report = {}
+    if on:
+        meter = _MessageMeter()
+        meter.attach()
+        caches, rss = cache_stats(), _rss_mb()
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        sections[name] = time.perf_counter() - start
+        if on:
+            meter.detach()
+            rss_after = _rss_mb()
+            report.update({
+                'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'section': name,
+                'seconds': round(sections[name], 4),
+                'bytes_sent': meter.total_bytes,
+                'elements': meter.elements,
+                'caches': _cache_delta(caches, cache_stats()),
+                'rss_mb': None if rss_after is None else round(rss_after, 1),
+                'rss_delta_mb': None if rss is None or rss_after is None else round(rss_after - rss, 1),
+                'peak_rss_mb': _peak_rss_mb(),
+            })
+            runs.append(report)
+            log.info(json.dumps(report, default=str))
+
+
+def top_imports(n=15):
+    """The slowest top-level imports seen so far, as (module, seconds)."""
+    roots = {}
+    for name, seconds in imports.items():
+        root = name.partition('.')[0]
+        roots[root] = max(roots.get(root, 0.0), seconds)
+    return sorted(roots.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+# --- fresh-interpreter import costs ---------------------------------------
+
+# What each part of the app needs to import.
+DEPENDENCIES = {
+    'streamlit': 'streamlit',
+    'pandas': 'pandas',
+    'numpy': 'numpy',
+    'plotly.express': 'plotly.express',
+    'plotly.graph_objects': 'plotly.graph_objects',
+    'plotly.io': 'plotly.io',
+    'streamlit_timeline': 'streamlit_timeline',
+    'housing.figures': 'housing.figures',
+    'housing.regression': 'housing.regression',
+}
+
+_IMPORTTIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (.*)$')
+
+
+def import_cost(module, baseline='streamlit'):
+    """Microseconds ``module`` adds on top of ``baseline`` in a fresh interpreter."""
+    code = 'import %s; import %s' % (baseline, module) if baseline else 'import %s' % module
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                         capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stderr
+    seen_baseline = not baseline
+    total = 0
+    for line in out.splitlines():
+        m = _IMPORTTIME.match(line)
+        if not m:
+            continue
+        name = m.group(3)
+        if not seen_baseline:
+            if name == baseline:
+                seen_baseline = True
+            continue
+        # Only top-level entries: nested ones are included in their parent.
+        if not name.startswith(' '):
+            total += int(m.group(2))
+    return total
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Report cold import cost of the app dependencies.')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='fail if any single dependency takes longer than this many seconds')
+    opts = parser.parse_args()
+
+    costs = []
+    for label, module in DEPENDENCIES.items():
+        baseline = None if module == 'streamlit' else 'streamlit'
+        costs.append((label, import_cost(module, baseline) / 1e6))
+    for label, seconds in sorted(costs, key=lambda kv: kv[1], reverse=True):
+        print('%-24s %7.1f ms' % (label, 1000 * seconds))
+    if opts.budget is not None and any(s > opts.budget for _, s in costs):
+        sys.exit(1)
@@ -0,0 +1,150 @@
+# Multi-resolution pre-aggregation of the raw series.
+#
+# For every series in the columnar store (housing/store.py) and every level
+# in LEVELS, the mean, min, max and last observation of each calendar period
+# are computed once and saved next to the store. Switching a chart or the
+# correlation analysis to another frequency is then a slice of a
+# memory-mapped array instead of a resample() over the raw observations.
+#
+# Each level is built in one pass over the whole store: the series are laid
+# end to end and sorted by date within each, so (series, period) changes only
+# at group boundaries and every statistic is a single ufunc.reduceat.
+
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from housing.store import DATE_DTYPE, STORE_DIR, atomic_write, open_store
+
+# Resample alias -> label shown in the app.
+LEVELS = {'W': 'Weekly', 'ME': 'Monthly', 'QE': 'Quarterly', 'YE': 'Annual'}
+STATS = ('mean', 'min', 'max', 'last')
+
+
+def _paths(store_dir, level=None):
+    if level is None:
+        return os.path.join(store_dir, 'pyramid.json')
+    return (os.path.join(store_dir, 'pyramid_%s_dates.npy' % level),
+            os.path.join(store_dir, 'pyramid_%s_values.npy' % level))
+
+
+def period_codes(dates, level):
+    """Integer period number of every datetime64 at ``level``."""
+    if level == 'W':
+        # Weeks ending on Sunday, like resample('W'); day 0 was a Thursday.
+        return (dates.astype('datetime64[D]').astype(np.int64) + 3) // 7
+    months = dates.astype('datetime64[M]').astype(np.int64)
+    return {'ME': months, 'QE': months // 3, 'YE': months // 12}[level]
+
+
+def period_ends(codes, level):
+    """The period-end date resample() labels each period code with."""
+    if level == 'W':
+        return (codes * 7 + 3).astype('datetime64[D]').astype(DATE_DTYPE)
+    months = {'ME': codes + 1, 'QE': (codes + 1) * 3, 'YE': (codes + 1) * 12}[level]
+    return (months.astype('datetime64[M]').astype('datetime64[D]') - 1).astype(DATE_DTYPE)
+
+
+def aggregate(dates, values, groups, level):
+    """Per (group, period) stats of sorted observations.
+
+    Returns (group of each row, period-end dates, (rows, 4) array of STATS).
+    """
+    keep = ~np.isnan(values)
+    dates, values, groups = dates[keep], values[keep], groups[keep]
+    if not len(values):
+        return groups, dates, np.empty((0, len(STATS)))
+    codes = period_codes(dates, level)
+    change = np.empty(len(values), dtype=bool)
+    change[0] = True
+    change[1:] = (groups[1:] != groups[:-1]) | (codes[1:] != codes[:-1])
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], len(values))
+    stats = np.column_stack([
+        np.add.reduceat(values, starts) / (ends - starts),
+        np.minimum.reduceat(values, starts),
+        np.maximum.reduceat(values, starts),
+        values[ends - 1],
+    ])
+    return groups[starts], period_ends(codes[starts], level), stats
+
+
+def build(store_dir=STORE_DIR):
+    """Aggregate every store series at every level and save the pyramid."""
+    store = open_store(store_dir, rebuild=False)
+    sids = sorted(store.manifest, key=lambda sid: store.manifest[sid]['offset'])
+    dates = np.concatenate([store.arrays(sid)[0] for sid in sids]) if sids else np.array([], DATE_DTYPE)
+    values = np.concatenate([store.arrays(sid)[1] for sid in sids]) if sids else np.array([])
+    groups = np.repeat(np.arange(len(sids)), [store.manifest[sid]['length'] for sid in sids])
+
+    manifest = {}
+    for level in LEVELS:
+        rows, ends, stats = aggregate(dates, values, groups, level)
+        offsets = np.searchsorted(rows, np.arange(len(sids) + 1))
+        manifest[level] = {sid: {'offset': int(offsets[i]), 'length': int(offsets[i + 1] - offsets[i])}
+                           for i, sid in enumerate(sids)}
+        # Temporary names first, so readers never map a half-written file.
+        for path, arr in zip(_paths(store_dir, level), (ends, stats)):
+            atomic_write(path, lambda f: np.save(f, arr))
+    atomic_write(_paths(store_dir), lambda f: json.dump(
+        {'store_version': store.version(), 'stats': list(STATS), 'levels': manifest}, f), 'w')
+
+
+class Pyramid:
+    """Read-only view of a built pyramid; accessors are zero-copy slices."""
+
+    def __init__(self, store_dir=STORE_DIR):
+        with open(_paths(store_dir)) as f:
+            meta = json.load(f)
+        self.version = meta['store_version']
+        self.manifest = meta['levels']
+        self._arrays = {}
+        for level in self.manifest:
+            dates_path, values_path = _paths(store_dir, level)
+            self._arrays[level] = (np.load(dates_path, mmap_mode='r'), np.load(values_path, mmap_mode='r'))
+
+    def arrays(self, sid, level, stat='mean', start=None, end=None):
+        """(period-end dates, values) of ``sid`` at ``level``, optionally date-bounded."""
+        meta = self.manifest[level][sid]
+        lo, hi = meta['offset'], meta['offset'] + meta['length']
+        dates, values = self._arrays[level]
+        dates = dates[lo:hi]
+        i = 0 if start is None else np.searchsorted(dates, np.datetime64(start, 's'), 'left')
+        j = len(dates) if end is None else np.searchsorted(dates, np.datetime64(end, 's'), 'right')
+        return dates[i:j], values[lo + i:lo + j, STATS.index(stat)]
+
+    def series(self, sid, level, stat='mean', start=None, end=None):
+        dates, values = self.arrays(sid, level, stat, start, end)
+        return pd.Series(values, index=pd.DatetimeIndex(dates), name=sid)
+
+
+_opened = {}
+# Serializes rebuilds and the handle cache between the sessions of one process.
+_lock = threading.Lock()
+
+
+def open_pyramid(store_dir=STORE_DIR):
+    """Open the pyramid, (re)building it whenever the store has changed."""
+    version = open_store(store_dir).version()
+    with _lock:
+        pyramid = _opened.get(store_dir)
+        if pyramid is not None and pyramid.version == version:
+            return pyramid
+        path = _paths(store_dir)
+        current = False
+        if os.path.exists(path):
+            with open(path) as f:
+                current = json.load(f).get('store_version') == version
+        if not current:
+            build(store_dir)
+        pyramid = _opened[store_dir] = Pyramid(store_dir)
+        return pyramid
+
+if __name__ == '__main__':
+    pyramid = open_pyramid()
+    for level, label in LEVELS.items():
+        rows = sum(meta['length'] for meta in pyramid.manifest[level].values())
+        print('  %-10s %7d periods' % (label, rows))
@@ -0,0 +1,51 @@
+# What-if predictions of the index from a fitted regression model.
+#
+# A Predictor holds everything a prediction needs: the OLS coefficients, their
+# covariance, the residual variance and the t quantile of the interval. It is
+# fitted once per data version and model; after that any number of
+# scenarios (rows of factor values) is priced with two matrix products and
+# nothing is refitted, so the sliders of the what-if panel stay responsive.
+
+import numpy as np
+import pandas as pd
+
+from housing.regression import TARGET, ols, t_isf2
+
+
+class Predictor:
+    """Point predictions and prediction intervals of one fitted OLS model."""
+
+    def __init__(self, factors, coef, cov, sigma2, t_crit, level):
+        self.factors = factors
+        self.coef = coef
+        self.cov = cov
+        self.sigma2 = sigma2
+        self.t_crit = t_crit
+        self.level = level
+
+    def predict(self, scenarios):
+        """Prediction and interval for every row of ``scenarios``.
+
+        ``scenarios`` is a DataFrame with a column per factor, or an array
+        of shape (scenarios, factors) in the order of ``self.factors``. The
+        interval covers a new observation: the uncertainty of the fitted
+        mean, x' Cov x, plus the residual variance.
+        """
+        if isinstance(scenarios, pd.DataFrame):
+            index, X = scenarios.index, scenarios[self.factors].to_numpy(dtype='float64')
+        else:
+            X = np.atleast_2d(np.asarray(scenarios, dtype='float64'))
+            index = None
+        A = np.column_stack([np.ones(len(X)), X])
+        mean = A @ self.coef
+        half = self.t_crit * np.sqrt(np.einsum('ij,jk,ik->i', A, self.cov, A) + self.sigma2)
+        return pd.DataFrame({'prediction': mean, 'lower': mean - half, 'upper': mean + half}, index=index)
+
+
+def fit(df, factors, target=TARGET, level=0.95):
+    """Fit ``target ~ const + factors`` and keep what predict() needs."""
+    res = ols(df, factors, target)
+    dof = res.n - len(res.factors) - 1
+    if dof <= 0:
+        raise ValueError('%d observations cannot fit %d factors' % (res.n, len(res.factors)))
+    return Predictor(res.factors, res.coef, res.cov, res.sigma2, t_isf2(1.0 - level, dof), level)
@@ -0,0 +1,256 @@
+# Columnar, memory-mapped store for the raw FRED series under data/.
+#
+# `python -m housing.store` parses every raw CSV once and packs all series
+# into two flat arrays: a datetime64[s] array of observation dates and a
+# float64 array of values, laid end to end. A JSON manifest records each
+# series' offset/length and the hash of the CSV it came from. Opening the
+# store memory-maps both arrays, so a series is a zero-copy slice and only
+# the pages that are actually touched are read from disk.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from housing.data import ROOT, file_hash
+
+STORE_DIR = os.path.join(ROOT, 'data', 'store')
+
+# Series id -> raw CSV under data/ (first column is the date).
+RAW_SERIES = {
+    'CSUSHPISA': 'CSUSHPISA.csv',
+    'DFF': 'DFF(Federal Funds Effective Rate).csv',
+    'EXSFHSUSM495S': 'EXSFHSUSM495S.csv',
+    'HNFSEPUSSA': 'HNFSEPUSSA.csv',
+    'HSN1F': 'HSN1F.csv',
+    'MDSP': 'MDSP.csv',
+    'MEHOINUSA672N': 'MEDIANINCOME(HOUSEHOLD).csv',
+    'MORTGAGE15US': 'MORTGAGE15US.csv',
+    'MORTGAGE30US': 'MORTGAGE30US.csv',
+    'PERMIT1': 'PERMIT1.csv',
+    'POPTHM': 'POPULATIONTHM.csv',
+    'UNRATE': 'UNEMPRATE.csv',
+    'GFDEBTN': 'public_debt.csv',
+    'CNP16OV_TTLHH': 'pops.csv',
+}
+
+DATE_DTYPE = 'datetime64[s]'
+
+# Serializes rebuilds and the handle cache between the sessions of one process.
+_lock = threading.RLock()
+# Path -> ((mtime, size), sha1): a raw CSV is only re-hashed once it is touched.
+_digests = {}
+# Manifest path -> ((mtime, size), series) for the stale check.
+_manifests = {}
+
+
+def _paths(store_dir):
+    return (os.path.join(store_dir, 'manifest.json'),
+            os.path.join(store_dir, 'dates.npy'),
+            os.path.join(store_dir, 'values.npy'))
+
+
+def atomic_write(path, write, mode='wb'):
+    """Write ``path`` through ``write(f)`` on a temporary file, then rename it.
+
+    The temporary name is unique, so concurrent writers never share one and
+    readers never map a half-written file.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    os.replace(tmp, path)
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _digest(path):
+    stamp = _stamp(path)
+    known = _digests.get(path)
+    if known is None or known[0] != stamp:
+        known = _digests[path] = (stamp, file_hash(path))
+    return known[1]
+
+
+def _manifest(path):
+    # The series of a manifest, re-read only when the file changes.
+    stamp = _stamp(path)
+    known = _manifests.get(path)
+    if known is None or known[0] != stamp:
+        with open(path) as f:
+            known = _manifests[path] = (stamp, json.load(f)['series'])
+    return known[1]
+
+
+def read_raw(path):
+    """Parse one raw FRED CSV into a float Series indexed by date."""
+    # FRED writes '.' for missing observations; some exports carry a BOM.
+    df = pd.read_csv(path, na_values=['.'], encoding='utf-8-sig')
+    dates = pd.to_datetime(df.iloc[:, 0])
+    return pd.Series(df.iloc[:, 1].astype('float64').to_numpy(),
+                     index=pd.DatetimeIndex(dates), name=df.columns[1])
+
+
+def _sources(raw_dir):
+    paths = {sid: os.path.join(raw_dir, fname) for sid, fname in RAW_SERIES.items()}
+    return {sid: path for sid, path in paths.items() if os.path.exists(path)}
+
+
+def is_stale(store_dir=STORE_DIR, raw_dir=None):
+    raw_dir = raw_dir or os.path.join(ROOT, 'data')
+    manifest_path, dates_path, values_path = _paths(store_dir)
+    if not all(os.path.exists(p) for p in (manifest_path, dates_path, values_path)):
+        return True
+    series = _manifest(manifest_path)
+    sources = _sources(raw_dir)
+    if set(series) != set(sources):
+        return True
+    return any(series[sid]['digest'] != _digest(path) for sid, path in sources.items())
+
+
+def build(store_dir=STORE_DIR, raw_dir=None, force=False):
+    """Convert the raw CSVs into the store. Returns True if it was rebuilt."""
+    raw_dir = raw_dir or os.path.join(ROOT, 'data')
+    with _lock:
+        if not force and not is_stale(store_dir, raw_dir):
+            return False
+        sources = _sources(raw_dir)
+        write({sid: read_raw(path) for sid, path in sources.items()}, store_dir,
+              {sid: {'source': os.path.relpath(path, ROOT), 'digest': _digest(path)}
+               for sid, path in sources.items()})
+        # A handle opened before maps the replaced files.
+        _opened.pop(store_dir, None)
+        return True
+
+
+def write(series, store_dir=STORE_DIR, meta=None):
+    """Pack a dict of id -> Series into a store at ``store_dir``.
+
+    ``meta`` optionally gives each id its source path and digest; series
+    without one (e.g. synthetic benchmark data) are hashed from their values.
+    """
+    meta = meta or {}
+    os.makedirs(store_dir, exist_ok=True)
+    manifest, dates, values = {}, [], []
+    offset = 0
+    for sid in sorted(series):
+        s = series[sid].sort_index()
+        d = s.index.to_numpy().astype(DATE_DTYPE)
+        v = s.to_numpy(dtype='float64')
+        entry = dict(meta.get(sid) or {'source': None,
+                                       'digest': hashlib.sha1(d.tobytes() + v.tobytes()).hexdigest()})
+        entry.update({
+            'offset': offset,
+            'length': len(s),
+            'start': str(s.index[0].date()) if len(s) else None,
+            'end': str(s.index[-1].date()) if len(s) else None,
+        })
+        manifest[sid] = entry
+        dates.append(d)
+        values.append(v)
+        offset += len(s)
+
+    manifest_path, dates_path, values_path = _paths(store_dir)
+    # Write to temporary names first so readers never map a half-written file.
+    for path, arr, dtype in ((dates_path, dates, DATE_DTYPE), (values_path, values, 'float64')):
+        atomic_write(path, lambda f: np.save(f, np.concatenate(arr) if arr else np.array([], dtype=dtype)))
+    atomic_write(manifest_path, lambda f: json.dump(
+        {'dtype': {'dates': DATE_DTYPE, 'values': 'float64'}, 'series': manifest}, f, indent=2), 'w')
+
+
+class SeriesStore:
+    """Read-only view over a built store; every accessor is zero-copy."""
+
+    def __init__(self, store_dir=STORE_DIR):
+        manifest_path, dates_path, values_path = _paths(store_dir)
+        # Stamped before reading, so a manifest replaced meanwhile still
+        # counts as changed.
+        self.stamp = _stamp(manifest_path)
+        with open(manifest_path) as f:
+            self.manifest = json.load(f)['series']
+        self._dates = np.load(dates_path, mmap_mode='r')
+        self._values = np.load(values_path, mmap_mode='r')
+        self._version = None
+
+    def __contains__(self, sid):
+        return sid in self.manifest
+
+    def __iter__(self):
+        return iter(self.manifest)
+
+    def names(self):
+        return list(self.manifest)
+
+    def digest(self, sid):
+        return self.manifest[sid]['digest']
+
+    def version(self):
+        """One hash over every source CSV the store was built from."""
+        if self._version is None:
+            h = hashlib.sha1()
+            for sid in sorted(self.manifest):
+                h.update(self.manifest[sid]['digest'].encode())
+            self._version = h.hexdigest()
+        return self._version
+
+    def arrays(self, sid, start=None, end=None):
+        """(dates, values) memmap slices for ``sid``, optionally date-bounded."""
+        meta = self.manifest[sid]
+        lo, hi = meta['offset'], meta['offset'] + meta['length']
+        dates = self._dates[lo:hi]
+        if start is not None or end is not None:
+            # Dates are sorted within a series, so bound with a binary search
+            # instead of scanning the column.
+            i = 0 if start is None else np.searchsorted(dates, np.datetime64(start, 's'), 'left')
+            j = len(dates) if end is None else np.searchsorted(dates, np.datetime64(end, 's'), 'right')
+            lo, hi = lo + i, lo + j
+            dates = self._dates[lo:hi]
+        return dates, self._values[lo:hi]
+
+    def series(self, sid, start=None, end=None):
+        dates, values = self.arrays(sid, start, end)
+        return pd.Series(values, index=pd.DatetimeIndex(dates), name=sid, copy=False)
+
+    def frame(self, sids=None, start=None, end=None):
+        """Outer-joined DataFrame of several series (this one does copy)."""
+        sids = sids or self.names()
+        return pd.concat([self.series(s, start, end) for s in sids], axis=1)
+
+
+_opened = {}
+
+
+def open_store(store_dir=STORE_DIR, rebuild=True):
+    """Open the store, building it first if it is missing or out of date.
+
+    Handles are kept per process so every session shares the same mapping,
+    and reopened once the manifest changes, e.g. after `python -m
+    housing.etl` rebuilt the store from another process.
+    """
+    with _lock:
+        if rebuild:
+            build(store_dir)
+        store = _opened.get(store_dir)
+        if store is None or store.stamp != _stamp(_paths(store_dir)[0]):
+            store = _opened[store_dir] = SeriesStore(store_dir)
+        return store
+
+
+if __name__ == '__main__':
+    import sys
+    rebuilt = build(force='--force' in sys.argv)
+    store = open_store(rebuild=False)
+    print(('Built' if rebuilt else 'Up to date:'), STORE_DIR)
+    for sid, meta in store.manifest.items():
+        print('  %-15s %6d rows  %s .. %s' % (sid, meta['length'], meta['start'], meta['end']))
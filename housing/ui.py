@@ -0,0 +1,140 @@
+# Streamlit helpers shared by the section pages under sections/.
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from housing import assets
+from housing import changepoints
+from housing import charts
+from housing import data as datasets
+from housing import events
+from housing import profiling
+from housing.downsample import downsample, lttb
+from housing.pyramid import LEVELS, open_pyramid
+from housing.store import open_store
+
+
+def show_image(name):
+    # Serve the pre-built WebP variants (python -m housing.assets) as static
+    # files; fall back to the original PNG if they have not been built.
+    tag = assets.img_tag(name)
+    if tag is None:
+        st.image(os.path.join(datasets.ROOT, name))
+    else:
+        st.markdown(tag, unsafe_allow_html=True)
+
+
+def combined_version():
+    """Content hash of finalcombined.csv, used to key the cached analysis."""
+    return datasets.version('combined')
+
+
+@st.cache_data
+def correlation_table(version):
+    """Correlation of every column of finalcombined.csv with the index."""
+    corr = datasets.load('combined').drop(columns=['DATE']).corr()
+    return corr[['CSUSHPISA']]
+
+
+# Points per line in the full-history charts: about one per horizontal pixel.
+HISTORY_POINTS = 1000
+
+
+@st.cache_data(max_entries=500)
+def history_window(version, sids, start, end, level='raw', points=HISTORY_POINTS):
+    """Each series between two years at ``level``, downsampled to ``points``.
+
+    ``level`` is 'raw' for the observations themselves or a pyramid level,
+    whose per-period mean comes with the period's min and max. Keyed by the
+    store version, level and range, so every zoom level is reduced once and
+    then served from the cache. Returns sid -> tuple for charts.history()
+    followed by the number of periods or observations in the range.
+    """
+    first, last = '%d-01-01' % start, '%d-12-31' % end
+    out = {}
+    if level == 'raw':
+        store = open_store()
+        for sid in sids:
+            dates, values = store.arrays(sid, first, last)
+            out[sid] = downsample(dates, values, points) + (len(dates),)
+        return out
+    pyramid = open_pyramid()
+    for sid in sids:
+        dates, mean = pyramid.arrays(sid, level, 'mean', first, last)
+        low = pyramid.arrays(sid, level, 'min', first, last)[1]
+        high = pyramid.arrays(sid, level, 'max', first, last)[1]
+        picked = lttb(dates, mean, points)
+        out[sid] = (dates[picked], mean[picked], low[picked], high[picked], len(dates))
+    return out
+
+
+@st.fragment
+def full_history(series, key):
+    """Full-history chart of ``sid -> label`` store series with range and frequency selectors.
+
+    The raw series are reduced server-side (LTTB) for the selected years, so
+    zooming in shows more detail while the chart payload stays bounded; the
+    other frequencies come pre-aggregated from the pyramid, shading each
+    period's min-max range. Timeline events in the selected years are shaded
+    behind the lines and detected regime changes marked with dashed lines.
+    """
+    store = open_store()
+    years = range(min(int(store.manifest[sid]['start'][:4]) for sid in series),
+                  max(int(store.manifest[sid]['end'][:4]) for sid in series) + 1)
+    col1, col2 = st.columns((2, 3))
+    labels = {'raw': 'As published', **LEVELS}
+    level = col1.radio('Frequency', list(labels), format_func=labels.get, horizontal=True, key=key + '_level')
+    start, end = col2.select_slider('Years', options=list(years), value=(years[0], years[-1]), key=key)
+    window = history_window(store.version(), tuple(series), start, end, level)
+    first, last = np.datetime64('%d-01-01' % start), np.datetime64('%d-12-31' % end)
+    shaded = events.load().overlapping(first, last)
+    breaks = changepoints.open_changepoints()
+    marked = sorted({d for sid in series for d in breaks.get(sid, ()) if first <= d <= last})
+    st.plotly_chart(charts.history({series[sid]: w[:-1] for sid, w in window.items()}, shaded, marked))
+    shown = sum(len(w[0]) for w in window.values())
+    unit = 'observations' if level == 'raw' else 'periods'
+    st.caption('%d of %d %s plotted' % (shown, sum(w[-1] for w in window.values()), unit))
+
+
+@st.cache_data
+def regime_breaks(version, sid, min_years):
+    """Regime changes of a store series with regimes of at least ``min_years``."""
+    return changepoints.detect(*open_store().arrays(sid), min_years)
+
+
+def profile_panel(report):
+    """Collapsible sidebar view of one profiled rerun (housing/profiling.py)."""
+    with st.sidebar.expander('Performance'):
+        if not report:
+            st.write('No profiled render yet.')
+            return
+        st.write('**%s**: %.0f ms, %.1f KiB sent' % (
+            report['section'], 1000 * report['seconds'], report['bytes_sent'] / 1024))
+        if report['rss_mb'] is not None:
+            st.caption('Memory: %.0f MiB resident (%+.1f this rerun), %.0f MiB peak' % (
+                report['rss_mb'], report['rss_delta_mb'], report['peak_rss_mb']))
+
+        st.write('Elements (time is spent producing each one)')
+        elements = pd.DataFrame.from_dict(report['elements'], orient='index')
+        if len(elements):
+            elements['ms'] = (1000 * elements.pop('seconds')).round(1)
+            st.dataframe(elements.sort_values('ms', ascending=False))
+
+        st.write('Caches')
+        caches = report['caches']
+        rows = [(name, caches[name]['hits'], caches[name]['misses']) for name in ('data', 'figures')]
+        st.dataframe(pd.DataFrame(rows, columns=['cache', 'hits', 'misses']).set_index('cache'))
+        # st.cache_data does not count hits, only what each function stores.
+        if caches['st.cache_data']:
+            st.dataframe(pd.DataFrame.from_dict(caches['st.cache_data'], orient='index')
+                         .rename_axis('st.cache_data'))
+
+        if profiling.imports:
+            st.write('Slowest first imports (ms)')
+            st.dataframe({name: round(1000 * s, 1) for name, s in profiling.top_imports()})
+        st.download_button('Download recent reruns (JSON)', json.dumps(list(profiling.runs), default=str),
+                           file_name='profile.json', mime='application/json')
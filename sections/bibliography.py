@@ -0,0 +1,51 @@
+# Bibliography section of the case study (see main.py).
+
+import streamlit as st
+
+st.header('Biblography 📚')
+html_string = '''<html>
+    <head>
+        <title> Biblography </title>
+    </head>
+    <body>
+        <table style="border-width: 1;">
+            <th style="background-color:lightgray;"> Refernces</th>
+            <tr>
+                <td>
+                    <a href="http://fred.stlouisfed.org">fred.stlouisfed.org</a>
+                </td>
+            </tr>
+            <tr>
+                <td>
+                    <a href="https://www.statista.com">statista.com</a>
+                </td>
+            </tr>
+            <tr>
+                <td>
+                    <a href="www.opendoor.com">opendoor.com</a>
+                </td>
+            </tr>
+            <tr>
+                <td>
+                    <a href="http://nar.realtor">nar.realtor</a>
+                </td>
+            </tr>     
+            <tr>
+                <td>
+                    <a href="https://tradingeconomics.com/">tradingeconomics.com</a>
+                </td>
+            </tr>  
+            <tr>
+                <td>
+                    <a href="https://data.worldbank.org">data.worldbank.org</a>
+                </td>
+            </tr>
+            <tr>
+                <td>
+                    <a href="https://www.cnbc.com">cnbc.com</a>
+                </td>
+            </tr>         
+        </table>
+    </body>
+</html>'''
+st.markdown(html_string, unsafe_allow_html=True)
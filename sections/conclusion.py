@@ -0,0 +1,16 @@
+# Conclusion section of the case study (see main.py).
+
+import streamlit as st
+
+st.header("Conclusion")
+st.write('''
+It is known that for a regression model the R-Squared value always increases and never decres incase the number of variables are increased.
+To make up for this, the Adjusted R-Squared penalises the R-Squared based on the number of variables. A very low Adjusted R-Square may indicate that some
+of the variables are not contributing. And as we take more variables the R-Squared value rises, which is represented in the above cases. 
+However, in the case 1, the Adjusted R-Squared value is very low, indicating that there is no variable that is not contributing at all. 
+\n The probablistic F-Static value for case 3 is lesser than that of case 1, indicating that the most correlated field, "Population", 
+does have great influence on the index. This also allows us to conclude, that the results of the correlation analysis are true and are proven here.
+Thus, we can say that the most import factors in order influencing the *S&P CoreLogic Case-Shiller U.S. National Home Price NSA Index* are the most 
+correlated factors. And that Multiple regression analysis is only useful in quantifying relationships in factors when there is a need to do predective
+modelling and not singling out one most important variable out of multiple variables.
+''')
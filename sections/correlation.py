@@ -0,0 +1,187 @@
+# Correlation analysis section of the case study (see main.py).
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from housing import align
+from housing import bootstrap
+from housing import changepoints
+from housing import charts
+from housing import correlation
+from housing import data as datasets
+from housing import ui
+from housing.pyramid import LEVELS
+from housing.store import open_store
+
+st.header('Determining the most influencial factor')
+st.write('''
+To Determine the most influencial factor of all the forementioned factors, 
+all the data for the factors were resampled to a similar time intervals and combined into a single dataframe:
+''')
+df = datasets.load('combined')
+# Content hash of finalcombined.csv: the cached analysis below is recomputed only when it changes.
+combined_version = ui.combined_version()
+st.dataframe(df)
+
+st.write('Here CUSUSHPISA is the S&P CoreLogic Case-Shiller U.S. National Home Price NSA Index')
+
+desc = df.describe()
+st.dataframe(desc)
+
+corr_inf = ui.correlation_table(combined_version)
+
+st.header("Correlation Analysis")
+col1,col2 = st.columns((1,1))
+col1.write('''
+
+''')
+col1.dataframe(corr_inf,  height=700)
+
+# A resource, not data: the figure is shared as is instead of being pickled
+# and unpickled on every rerun. Do not mutate it.
+@st.cache_resource
+def correlation_heatmap(version):
+    corr = datasets.load('combined').drop(columns=['DATE']).corr()
+    return charts.correlation_heatmap(corr)
+
+col2.plotly_chart(correlation_heatmap(combined_version))
+
+col11,col12 = st.columns((2,1))
+corr_inf_new = corr_inf.head(10)
+fig = px.bar(corr_inf_new)
+col11.plotly_chart(fig)
+col12.title("_")
+col12.write('''
+This analysis shows how the factors are correlated with the index and amongst themselves. Higher the bars in the graph 
+(in magnitude) on the left, the more correlated the factors are with the index. 
+\n For all the plots above the 0 value, there is a positive correlation and vice-versa.
+''')
+
+col1, col2 = st.columns((2,1))
+col1.write('''
+The absolute values indicate the level of correlation and the sign shows the relation, i.e either positive or negative correlation.
+\n The most correlated factors(in order) are:
+''')
+data = abs(corr_inf_new)
+sorted_data = data.sort_values(by=['CSUSHPISA'], ascending=False)
+col2.dataframe(sorted_data, height=700)
+
+@st.cache_data
+def correlation_intervals(version):
+    return bootstrap.correlation_ci(datasets.load('combined').drop(columns=['DATE']))
+
+intervals = correlation_intervals(combined_version)
+col1.write('''
+With only about 20 yearly observations these correlations are uncertain. The 95% intervals below come from 5000 
+block-bootstrap resamples (blocks of 3 consecutive years); a ranking between two factors whose intervals overlap 
+heavily should not be over-interpreted.
+''')
+col1.dataframe(intervals.reindex(sorted_data.index))
+
+st.subheader('Direct effects and multicollinearity')
+st.write('''
+Population, income and permits all trend upwards together, so a high correlation with the index does not by itself
+mean a direct effect. The partial correlation is the correlation of two series once every other series is held fixed,
+and the variance inflation factor (VIF) of a factor measures how much of it is explained by the other factors:
+above 10 it is largely redundant with them.
+''')
+
+@st.cache_data
+def multicollinearity(version):
+    return correlation.partial_correlations(datasets.load('combined'))
+
+partial, vif = multicollinearity(combined_version)
+col1, col2 = st.columns((1,2))
+direct = corr_inf.rename(columns={'CSUSHPISA': 'Correlation'}).assign(
+    **{'Partial correlation': partial['CSUSHPISA'], 'VIF': vif}).drop(index='CSUSHPISA')
+col1.dataframe(direct.sort_values('Partial correlation', key=abs, ascending=False), height=450)
+col2.plotly_chart(charts.correlation_heatmap(partial, title='Partial correlations'))
+
+@st.cache_data
+def aligned_factors(version, freq):
+    return align.build_combined(freq, start='1987', fill='interpolate')
+
+st.subheader('Correlation at other resolutions')
+st.write('''
+The table above uses the yearly data the case study was built on. Below, the same correlations are computed from the 
+full history of every series since 1987 at the chosen resolution (annual-only series are interpolated).
+''')
+
+@st.fragment
+def correlation_by_resolution():
+    freq = st.radio('Resolution', list(LEVELS), index=3, format_func=LEVELS.get, horizontal=True,
+                    key='corr_resolution')
+    corr = aligned_factors(align.combined_version(), freq).corr()
+    col1, col2 = st.columns((1,2))
+    target = corr[['CSUSHPISA']].drop(index='CSUSHPISA')
+    col1.dataframe(target.sort_values('CSUSHPISA', key=abs, ascending=False), height=450)
+    col2.plotly_chart(charts.correlation_heatmap(corr))
+
+correlation_by_resolution()
+
+st.subheader('Rolling correlation with the index')
+st.write('''
+A single correlation over the whole period hides how the relationships change from one regime to the next, e.g. 
+mortgage rates before and after 2008. The chart below shows the correlation of every factor with the index over a 
+trailing window, using the full history of each series (annual series are interpolated to the chosen resolution).
+''')
+
+@st.fragment
+def rolling_correlation():
+    # Only this block reruns while the controls are being dragged.
+    col1, col2 = st.columns((1,2))
+    per_year = {'W': 52, 'ME': 12, 'QE': 4}
+    freq = col1.radio('Resolution', list(per_year), index=1, format_func=LEVELS.get, horizontal=True,
+                      key='rolling_resolution')
+    years = col2.slider('Window length (years)', 1, 10, 3)
+    df = aligned_factors(align.combined_version(), freq)
+    rolling = correlation.rolling_corr(df, window=years * per_year[freq])
+    fig = px.line(rolling, labels={'value': 'Correlation with CSUSHPISA', 'variable': 'Factor'})
+    fig.update_yaxes(range=[-1, 1])
+    st.plotly_chart(fig)
+
+rolling_correlation()
+
+st.subheader('Correlation by regime')
+st.write('''
+The regimes the narrative refers to (the 2001 recession, the 2008 crash, the pandemic) can also be found from the data
+itself: the index is split wherever its month-on-month change shifts in level or volatility (the dashed lines on the
+full-history charts), and the correlations below are computed within each regime on the monthly data.
+''')
+
+@st.fragment
+def correlation_by_regime():
+    min_years = st.select_slider('Shortest regime (years)', [1, 2, 3, 5], value=3, key='corr_regime_years')
+    breaks = ui.regime_breaks(open_store().version(), 'CSUSHPISA', min_years)
+    df = aligned_factors(align.combined_version(), 'ME')
+    table = pd.DataFrame(changepoints.by_regime(
+        df, breaks, lambda part: part.corr()['CSUSHPISA'].drop('CSUSHPISA'), min_rows=12)).T
+    fig = px.imshow(table, zmin=-1, zmax=1, color_continuous_scale='RdBu_r', aspect='auto', text_auto='.2f',
+                    labels={'color': 'Correlation with CSUSHPISA'})
+    st.plotly_chart(fig)
+
+correlation_by_regime()
+
+st.subheader('Lead and lag')
+st.write('''
+Housing prices react to mortgage rates, permits and unemployment with a delay. For every pair of series the 
+correlation below is computed with one series shifted by 0 to 36 months; the table shows, for each factor, the lead 
+at which it tracks the chosen series most closely.
+''')
+
+@st.cache_data
+def lead_lag_cube(version, max_lag):
+    df = aligned_factors(version, 'ME')
+    return correlation.lagged_corr(df, max_lag=max_lag), list(df.columns)
+
+cube, names = lead_lag_cube(align.combined_version(), 36)
+col1, col2 = st.columns((1,1))
+reference = col1.selectbox('Series', names, index=names.index('CSUSHPISA'))
+col1.dataframe(correlation.peak_lags(cube, names, target=reference))
+ref = names.index(reference)
+others = [n for n in names if n != reference]
+fig = px.imshow(cube[[names.index(n) for n in others], ref], x=list(range(cube.shape[2])), y=others,
+                zmin=-1, zmax=1, color_continuous_scale='RdBu_r', aspect='auto',
+                labels={'x': 'Months the factor leads by', 'color': 'Correlation'})
+col2.plotly_chart(fig)
@@ -0,0 +1,43 @@
+# Household debt section of the case study (see main.py).
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from housing import figures
+from housing import ui
+
+st.header('Household Debt')
+colm1,colm2 = st.columns((3,4))
+colm1.write('''
+There are many types of debt, including household debt, and many specific types of household debt as well. 
+\nThe graph on the right shows Mortgage Debt Service Payments as a Percent of Disposable Personal Income. 
+\nThe financial burdens from mortgages debt vary quite a bit. Let’s consider two reasons for this: The larger 
+the debt, the larger the burden, as households need to pay more interest on a larger principal. And changes 
+in interest rates obviously influence how much is paid to service loans.\n The mortgage debt increased from the early 1990s until the past recession, 
+when it decreased. This decrease is the result of the combination of the two effects noted above: the amount of debt and interest rates. 
+With one exception (in the fourth quarter of 2012), total debt obligations are at the lowest they’ve been since these data were first 
+collected. And this is especially true of mortgage debt.
+
+''')
+
+fig = figures.get('debt')
+colm2.plotly_chart(fig)
+with colm2.expander('Full history'):
+    ui.full_history({'MDSP': 'Mortgage debt service payments, % of income'}, key='debt_history')
+
+labels = ['Mortgage','Student','Others']
+values = [10.44, 1.58, 3.22]
+# Use `hole` to create a donut-like pie chart
+fig = go.Figure(data=[go.Pie(labels=labels, values=values, hole=.3)])
+
+col1,col2 = st.columns((1,2))
+with col2:
+    st.plotly_chart(fig)
+
+with col1:
+    st.write('**Mortgage debt as a fraction of total household debt**')
+    st.write('''
+    Mortgage Debt Service Payments as a Percent of Disposable Personal Income was 3.81% in April of 2021, according to the United States Federal Reserve.\nHistorically, United States - Mortgage Debt Service Payments as a Percent of Disposable Personal Income reached a record high of 7.18 in October of 2007 and a record low of 3.51 in January of 2021. 
+    By the end of 2021, a record level of household debt was reached. Mortgage being the biggest contributor to it being 68.5% at 10.44 Trillion Dollars. Student debt was the second highest contributor with 21.1% at 1.58 Trillion Dollars.
+
+    ''')
@@ -0,0 +1,32 @@
+# Existing home sales section of the case study (see main.py).
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from housing import figures
+
+st.header('Existing Home Sales')
+colm1,colm2 = st.columns((3,4))
+colm1.write('''
+The steady rise in sales after the sharp drop in 2008 is indicative of the general consensus that the housing market is recovering. Construction is showing positive signs, consumers are growing in confidence and are becoming freer with their spending and the market is entering new periods of growth. 
+\n
+This is a far cry from the dire situation in the not too distant past, in the run up to the bursting of the U.S. housing bubble. Interest rates were very low at that time, making credit cheap and abundantly available. Banks and lending institutions led people to believe that it was okay to buy multiple properties with little money and that real estate was just about the safest investment anyone could make. More and more people decided to take the risk and invest in the market. This coupled with the increased number of people descending on the market caused prices to soar; it seemed like an easy way to make cash fast. But this is how the bubble formed and it was this bubble, upon bursting, that would set into motion a chain of events that would bring the global economy to its knees; plunging the world into an economic depression of which it has not seen the likes since the Great Depression of the 1930s.
+''')
+
+fig = figures.get('existing_sales')
+colm2.plotly_chart(fig)
+col1,col2 = st.columns((2,1))
+
+labels = ['Exisiting Homes Sold','New Homes Sold']
+values = [5640000, 822000]
+
+fig = go.Figure(data=[go.Pie(labels=labels, values=values, textinfo='label+percent',
+                             insidetextorientation='radial'
+                            )])
+col1.plotly_chart(fig)
+
+with col2:
+    st.write('''
+    **U.S. existing home sales 2005-2023**
+    \nIn 2021, the U.S. home sales in the United States surged, reaching the highest value observed since 2006. A total of 6.1 million housing transactions were completed in that year, up from 5.6 million in 2020. According to the forecast, sales activity is expected to slow down slightly in 2022 and increase again in 2023. 
+    ''')
@@ -0,0 +1,36 @@
+# Income section of the case study (see main.py).
+
+import streamlit as st
+
+from housing import figures
+from housing import ui
+
+st.header('Income 💵')
+colm1,colm2 = st.columns((3,4))
+colm1.write('''
+The shortfall in household income is attributable in part to two recessions since 2000. The first recession, lasting from March 2001 to November 2001, was relatively short-lived.7 Yet household incomes were slow to recover from the 2001 recession and it was not until 2007 that the median income was restored to about its level in 2000.
+
+\nBut 2007 also marked the onset of the Great Recession, and that delivered another blow to household incomes. This time it took until 2015 for incomes to approach their pre-recession level. Indeed, the median household income in 2015 – $70,200 – was no higher than its level in 2000, marking a 15-year period of stagnation, an episode of unprecedented duration in the past five decades.8
+
+\nMore recent trends in household income suggest that the effects of the Great Recession may finally be in the past. From 2015 to 2018, the median U.S. household income increased from 70,200 to 74,600 dollars, at an annual average rate of 2.1%.
+''')
+
+col1,col2 = st.columns((3,4))
+with col2:
+    ui.show_image('aff.png')
+
+with col1:
+    st.write('**Affordability of Homes**')
+    st.write('''
+    
+Steady job growth and an increase in the median wage continue to fuel housing demand. Aside from rising wages, another good sign of financial health is spending less disposable income on repaying debts like credit cards, auto loans, and personal loans.
+
+Today, household budgets continue to be the strongest they’ve been in over 40 years and a far cry from 2008, suggesting consumers have more disposable income to buy a home.
+
+    ''')
+
+
+fig = figures.get('income')
+colm2.plotly_chart(fig)
+with colm2.expander('Full history'):
+    ui.full_history({'MEHOINUSA672N': 'Median Income'}, key='income_history')
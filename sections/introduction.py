@@ -0,0 +1,57 @@
+# Introduction section of the case study (see main.py).
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from housing import figures
+from housing import ui
+
+st.header('Introduction')
+col1,col2 = st.columns((2,1))
+col1.write('''
+
+Saying that the housing market is influenced by a myriad of factors could be an understatement. 
+The entire process of reverse engineering something as complex and as complicated as a housing market requires in-depth and 
+unbiased analysis which in turn produces credible predictive analytics.
+
+The **S&P CoreLogic Case-Shiller U.S. National Home Price NSA Index** measures the change in the value of the U.S. 
+residential housing market by tracking the purchase prices of single-family homes, which I have used as a proxy for home prices.
+
+As of October 2021, there were 208.4 million single-family dwelling units in the United States and only 37.8 million multifamily units. 
+**The size of single-family housing units has steadily risen since the start of the 21st century.**
+
+There is an upward trend in the average size of floor area in new single-family homes. In 1975, a new home had an average floor area of about 1,660 square feet.
+By 2019, this figure had **increased by** about 900 square feet.
+
+''')
+
+labels = ['Multi-family dwelling unit', 'Single Family dewlling unit', 'Others']
+sizes = [37.75, 208.36, 10.67]
+explode = (0, 0.1, 0)  # only "explode" the 2nd slice 
+
+# Plotly rather than matplotlib: this is the landing page, and pyplot alone
+# added about half a second to every cold start.
+fig1 = go.Figure(data=[go.Pie(labels=labels, values=sizes, pull=explode, textinfo='percent',
+                              texttemplate='%{percent:.1%}', direction='clockwise', rotation=90)])
+fig1.update_layout(title="The single-family units as a fraction of all the housing units in USA")
+
+col2.plotly_chart(fig1)
+
+st.write('''
+The interavtive rgraph below shows how the S&P CoreLogic Case-Shiller U.S. National Home Price NSA Index has changed in the past 2 years. 
+The data has been adjusted to show quaterly mean.
+''')
+
+col1,col2 = st.columns((2,1))
+
+fig = figures.get('snp')
+col1.plotly_chart(fig)
+with col1.expander('Full history'):
+    ui.full_history({'CSUSHPISA': 'Index'}, key='snp_history')
+
+col2.markdown('''_
+\n 
+The Case Shiller Home Price Index averaged 169.87 points from 2000 until 2021. 
+\n It reached an all-time high of 257.10 points in April 2021.
+\nIt reached a record low of 100 points in January 2000.
+''')
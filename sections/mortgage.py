@@ -0,0 +1,29 @@
+# Mortgage rate section of the case study (see main.py).
+
+import streamlit as st
+
+from housing import figures
+from housing import ui
+
+st.header('Mortgage Rate')
+colm1,colm2 = st.columns((3,4))
+colm1.write('''
+Monetary policy affects interest rates, which affect mortgages, which affect housing market decisions. That may be simple to grasp, but the housing statistics may not follow such clear-cut patterns. 
+
+\nThe graph's red line represents the average 30-year fixed-rate mortgage for the last 20 years. For the same time period, the blue line in the graph represents the ratio of house starts built by contractors to housing starts built by owners. 
+
+\nFrom 2000 to 2007, this ratio remained largely steady, hovering around 1.5, meaning that contractors built roughly 60% of new starts. However, during periods of macroeconomic turmoil, the ratio has deviated from its historical average.
+\nBut during the Great Recession, this ratio increased sharply, to over 2.0, peaking at 2.6 in 2016, which implies contractors built 72% of housing starts. In both cases, GDP declined and unemployment rose, but this housing measure behaved differently.
+''')
+
+st.write('''
+A clear difference between these two episodes is the level of mortgage rates: Rates were much higher in the Great Recession. As mortgage rates go up, the ratio goes down and vice versa.
+A potential reason is that, as the price of mortgages increases, the cost of purchasing a new home from a contractor increases relative to the cost of building one’s own home. And, if the costs are basically the same, 
+many would-be homeowners might choose to build their own home rather than purchase one that someone else built. 
+''')
+
+fig = figures.get('mortgage')
+colm2.plotly_chart(fig)
+with colm2.expander('Full history'):
+    ui.full_history({'MORTGAGE30US': '30-year fixed', 'MORTGAGE15US': '15-year fixed'},
+                    key='mortgage_history')
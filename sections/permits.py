@@ -0,0 +1,33 @@
+# New single family unit permits section of the case study (see main.py).
+
+import streamlit as st
+
+from housing import figures
+from housing import ui
+
+st.header('New Single Family Unit Permits 📋')
+colm1,colm2 = st.columns((3,4))
+colm1.write('''
+\nSingle-family housing starts were pridicted to total 1 million in 2020, the highest since 2007. However, 
+There were only approximately 978,000 building permits for single-family housing units granted in the United States in 2020, which is 
+an increase of around 116,000 on the previous year. Units have steadily increased since 2011, but the numbers remain considerably 
+lower than the 1.68 million authorized by building permits in 2005.
+\nThat was about 3 years prior to the housing market meltdown that spurred a global financial rout. 
+\nThe rising cost of land, labor, building materials, and regulations, are some of the reasons why we can see significantly more blue (people who may need homes) in the graph below, than orange (total homes built) since 2008. You can also see that few of the new homes built were “starter homes” focused on first-time buyers.
+''')
+
+fig = figures.get('permits')
+colm2.plotly_chart(fig)
+with colm2.expander('Full history'):
+    ui.full_history({'PERMIT1': 'No. of permits issued in thousands',
+                     'HSN1F': 'No. of one family homes sold in thousands'}, key='permits_history')
+col1,col2 = st.columns((1,1))
+with col1:
+    ui.show_image('new_perms.png')
+
+with col2:
+    st.write('''
+    \n Even though the new homes built by 2020 were the fastest rate since 2007, Single-family home construction is running at the slowest pace since 1995.
+    \nThe U.S. is short 5.24 million homes, an increase of 1.4 million from the 2019 gap of 3.84 million.
+    \nSingle-family home construction has suffered from a severe labor shortage that began well before the pandemic but was then exacerbated by it. Supply chain disruptions in the past year have pushed prices for building materials higher, and as pandemic-induced demand soared, prices for land increased as well. While new household formation is actually slower than it was before the pandemic, homebuilders would have to double their recent new home production pace to close the gap in five to six years. A new household can be either owner-occupied or rented.
+    ''')
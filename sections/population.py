@@ -0,0 +1,35 @@
+# Population section of the case study (see main.py).
+
+import streamlit as st
+
+from housing import figures
+from housing import ui
+
+st.header('Factors and How They Influenced The Past 2 Decades 📊')
+st.header('Population 🧑🏻‍🤝‍🧑🏾')
+colm1,colm2 = st.columns((3,4))
+colm1.write('''
+The U.S. population increased by 10 percent between 2000 and 2010 and is projected to increase by 8 percent between 2010 and 2020, from 309 million to 333 million. An 8 percent gain would be the smallest percentage increase in the U.S. population between censuses since the 1930s.
+\nThe population-housing relationship is a two-way street. On the one hand, population growth causes a shift in housing demand. Population growth, and especially an increase in the number of households, leads to an increase in housing demand.
+\nPopulation decline might lead to a decrease in housing demand. This will, however, only happen in the long run, after not only the number of people but also the number of households has started to decline. The danger of population decline is greatest in remote rural areas and in areas with lower-quality housing.
+At the same time, the supply of housing influences the opportunities for population increase through migration.
+
+''')
+
+
+
+fig = figures.get('population')
+colm2.plotly_chart(fig)
+with colm2.expander('Full history'):
+    ui.full_history({'POPTHM': 'Population in thousands'}, key='population_history')
+
+col1,col2 = st.columns((3,4))
+fig = figures.get('household_size')
+with col2:
+    st.plotly_chart(fig)
+
+with col1:
+    st.write('**Poplulation level/Total household** 🧑🏻‍🤝‍🧑🏾/🏠')
+    st.write('''
+    The graph shows that the number of people in each household has decreased in the longer time period. So the number of households in the US has increased faster than population, which means that any measure divided by population grows faster than one divided by number of households.
+    ''')
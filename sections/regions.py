@@ -0,0 +1,52 @@
+# Regional view of the case study (see main.py): the correlation and
+# regression analysis repeated for every metro and state index in data/regional/.
+
+import plotly.express as px
+import streamlit as st
+
+from housing import align
+from housing import panel
+
+st.header('Regional view')
+
+if not panel.files():
+    st.info('''
+No regional indices found. Download FRED series as CSV into data/regional/, one file per series named after its id:
+the S&P CoreLogic Case-Shiller metro indices (SFXRSA.csv, NYXRSA.csv, ...) and/or the FHFA state indices
+(CASTHPI.csv, TXSTHPI.csv, ...).
+''')
+    st.stop()
+
+st.write('''
+The national index hides large regional differences. Here every regional index found in data/regional/ is set against
+the same factors at a quarterly resolution, all regions at once.
+''')
+
+@st.cache_data
+def regional_panel(version):
+    return panel.Panel.load(freq='QE', start='1987')
+
+@st.cache_data
+def regional_factors(version):
+    return align.build_combined('QE', start='1987', fill='interpolate').drop(columns=['CSUSHPISA'])
+
+regional = regional_panel(panel.version())
+# Keyed on the store and the yearly tables it is built from, not on finalcombined.csv.
+factors = regional_factors(align.combined_version())
+names = dict(zip(regional.regions, regional.names()))
+prices = regional.frame().rename(columns=names)
+corr = regional.correlations(factors).rename(index=names)
+
+st.subheader('Correlation with the factors')
+st.write('{} regions, {} to {}.'.format(prices.shape[1], prices.index[0].year, prices.index[-1].year))
+regions = st.multiselect('Regions', list(corr.index), default=list(corr.index[:10]))
+if regions:
+    fig = px.imshow(corr.loc[regions], zmin=-1, zmax=1, color_continuous_scale='RdBu_r', aspect='auto')
+    st.plotly_chart(fig)
+    st.line_chart(prices[regions])
+
+st.subheader('Regression by region')
+chosen = st.multiselect('Factors', list(factors.columns), default=list(factors.columns[:3]))
+if chosen:
+    fit = regional.regress(factors[chosen]).rename(index=names)
+    st.dataframe(fit.loc[regions] if regions else fit)
@@ -0,0 +1,195 @@
+# Explanatory regression analysis section of the case study (see main.py).
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from housing import align
+from housing import bootstrap
+from housing import changepoints
+from housing import charts
+from housing import data as datasets
+from housing import forecast
+from housing import regression
+from housing import scenario
+from housing import ui
+from housing.store import open_store
+
+st.header("Explanatory Regression Analysis")
+
+combined_version = ui.combined_version()
+corr_inf_new = ui.correlation_table(combined_version).head(10)
+top_5 = abs(corr_inf_new).sort_values(by=['CSUSHPISA'], ascending=False).head(5)
+
+@st.cache_data
+def regression_case(version, factors):
+    df = datasets.load('combined')
+    res = regression.ols(df, list(factors))
+    # 95% block-bootstrap intervals next to the classical standard errors.
+    intervals = bootstrap.coefficient_ci(df, list(factors))
+    return res.summary().to_frame('Value'), res.coefficients().join(intervals)
+
+@st.cache_data
+def best_factor_sets(version):
+    return regression.best_subsets(datasets.load('combined').drop(columns=['DATE']))
+
+def show_fit(col, factors):
+    summary, coefs = regression_case(combined_version, tuple(factors))
+    col.dataframe(summary)
+    col.dataframe(coefs)
+
+st.write('''
+Next, a multiple regression analysis was performed on the cleaned and combined data. Given in the case, in which we would like to predict the prices
+of the index, a multiple regression model would have been created and only the factor(s) influencing it the most would be chosen. Here, only the analysis 
+is performed in order to examine whether:\n 1) Is it better to take all the factors into consideration?
+\n2) Is it better to take only the top 5 highest correlated data into consideration? 
+\n 3) Is it better to just take one factor into consideration?
+\n Each of the cases is examined and the output is explained below.
+''')
+##
+col1,col2 = st.columns((1,1))
+
+col1.write('''
+Case 1) Building a multiple regression model taking all the factors into consideration:
+''')
+
+col1.dataframe(corr_inf_new, height=700)
+
+show_fit(col2, corr_inf_new.index)
+##
+col1.write('''
+Case 2) The asbolute values of the correlation table have been sorted and the 5 factors with the highest correlation are represented in the table
+below. When these factors(only) are taken into consideration:
+''')
+
+
+col1.dataframe(top_5)
+
+show_fit(col2, top_5.index)
+##
+col1.write('''
+Case 3) Only the most correlated factor i.e. the population was taken into consideration:
+''')
+
+data = abs(corr_inf_new)
+sorted_data = data.sort_values(by=['CSUSHPISA'], ascending=False)
+top_1 = sorted_data.head(1)
+col1.dataframe(top_1)
+
+show_fit(col2, top_1.index)
+
+##
+st.subheader('Best factor set')
+subsets = best_factor_sets(combined_version)
+st.write('''
+Rather than hand-picking the cases above, every possible combination of the factors ({} models) was fitted and ranked by
+Adjusted R-Squared. The best 10 combinations are:
+'''.format(len(subsets)))
+st.dataframe(subsets.head(10))
+
+st.subheader('Forecasting backtest')
+st.write('''
+The models above explain the index after the fact. To see whether any of them could have *predicted* it, every 
+combination of the factors was run through a walk-forward backtest on the full monthly history: at each month the 
+model is fitted only on what was known by then, forecasts the index the chosen number of months ahead, and is then 
+updated with the next observation. Each model is compared with simply carrying today's index forward (a random walk); 
+a ratio below 1 means the model beat it out of sample.
+
+"Known by then" includes the factors themselves: every series is dated by when it was first published (e.g. a year's 
+median income in the September after it ends) and carried forward until the next release, never interpolated towards 
+a value that was not out yet.
+''')
+
+@st.cache_data
+def backtest(version, horizon):
+    bt = forecast.walk_forward(forecast.released_history('ME', start='1987'), horizon=horizon)
+    return bt.scores, bt.predictions, bt.actual, bt.naive
+
+@st.fragment
+def forecasting_backtest():
+    col1, col2 = st.columns((1,2))
+    horizon = col1.select_slider('Forecast horizon (months)', [1, 3, 6, 12, 24], value=12)
+    scores, predictions, actual, naive = backtest(align.combined_version(), horizon)
+    col1.write('{} models backtested. Best 10 out of sample:'.format(len(scores)))
+    col1.dataframe(scores.head(10).set_index('factors')[['Forecasts', 'RMSE', 'RMSE vs random walk']])
+    model = col2.selectbox('Model', scores['factors'].head(50))
+    chart = actual.to_frame('CSUSHPISA').assign(Forecast=predictions[model], **{'Random walk': naive})
+    fig = px.line(chart.dropna(subset=['Forecast']), labels={'value': 'Index', 'variable': ''})
+    col2.plotly_chart(fig)
+
+forecasting_backtest()
+
+st.subheader('Fit by regime')
+st.write('''
+A single fit over the whole history assumes the relationships never change. Below, the chosen model is fitted separately 
+within each regime of the index, found where its month-on-month change shifts in level or volatility (see the 
+correlation section), on the monthly data with annual series interpolated.
+''')
+
+@st.cache_data
+def regime_fits(version, store_version, factors, min_years):
+    df = align.build_combined('ME', start='1987', fill='interpolate')[['CSUSHPISA'] + list(factors)].dropna()
+    breaks = ui.regime_breaks(store_version, 'CSUSHPISA', min_years)
+
+    def fit(part):
+        res = regression.ols(part, list(factors))
+        return pd.concat([res.summary()[['Observations', 'R-squared', 'Adj. R-squared']],
+                          pd.Series(res.coef, index=['const'] + list(factors))])
+    return pd.DataFrame(changepoints.by_regime(df, breaks, fit, min_rows=3 * (len(factors) + 1))).T
+
+@st.fragment
+def fit_by_regime():
+    col1, col2 = st.columns((2,1))
+    model = col1.selectbox('Model', list(subsets['factors'].head(10)), key='regime_model')
+    min_years = col2.select_slider('Shortest regime (years)', [1, 2, 3, 5], value=3, key='fit_regime_years')
+    st.dataframe(regime_fits(align.combined_version(), open_store().version(), tuple(model.split(', ')), min_years))
+
+fit_by_regime()
+
+st.subheader('What-if scenarios')
+st.write('''
+Set the factors below to a scenario of your own, e.g. a 30-year mortgage rate of 8%, and the chosen model predicts the
+index with its 95% prediction interval. The model is fitted once on the yearly data; moving a slider only evaluates
+it. The chart varies one factor across its whole range with the others held at the scenario. Scenarios far outside
+the observed values are extrapolations from about 20 years of data, and the widening interval shows it.
+''')
+
+@st.cache_data
+def predictor(version, factors):
+    return scenario.fit(datasets.load('combined'), list(factors))
+
+def slider_range(values):
+    # The observed range, widened by half of it on each side (never below 0
+    # for factors that never were).
+    lo, hi = float(values.min()), float(values.max())
+    pad = (hi - lo) / 2 or abs(hi) / 2 or 1.0
+    return (max(lo - pad, 0.0) if lo >= 0 else lo - pad), hi + pad
+
+@st.fragment
+def what_if():
+    df = datasets.load('combined')
+    models = ['All factors'] + list(subsets['factors'].head(10))
+    model = st.selectbox('Model', models, key='scenario_model')
+    factors = [c for c in df.columns if c not in ('DATE', 'CSUSHPISA')] if model == 'All factors' else model.split(', ')
+    fitted = predictor(combined_version, tuple(factors))
+
+    values, ranges = {}, {}
+    cols = st.columns(3)
+    for i, factor in enumerate(factors):
+        ranges[factor] = lo, hi = slider_range(df[factor])
+        last = float(df[factor].dropna().iloc[-1])
+        values[factor] = cols[i % 3].slider(factor, lo, hi, last, step=(hi - lo) / 200, key='scenario_' + factor)
+    current = fitted.predict(pd.DataFrame([values])).iloc[0]
+
+    col1, col2 = st.columns((1,2))
+    col1.metric('Predicted CSUSHPISA', '%.1f' % current['prediction'],
+                '%+.1f vs. the latest year' % (current['prediction'] - df['CSUSHPISA'].dropna().iloc[-1]))
+    col1.caption('95%% prediction interval: %.1f to %.1f' % (current['lower'], current['upper']))
+    vary = col2.selectbox('Vary', factors, key='scenario_vary')
+    # Every point of the curve is one scenario; all are evaluated at once.
+    grid = np.linspace(*ranges[vary], 101)
+    sweep = pd.DataFrame([values] * len(grid)).assign(**{vary: grid})
+    col2.plotly_chart(charts.prediction_band(grid, fitted.predict(sweep), vary, current=values[vary]))
+
+what_if()
@@ -0,0 +1,24 @@
+# Brief timeline section of the case study (see main.py).
+
+import json
+
+import streamlit as st
+from streamlit_timeline import timeline
+
+from housing import events
+
+st.header('A Brief Timeline ⏱️ of Major Economic Events')
+
+# The events are parsed once per process; only those in the selected years
+# are handed to the timeline component.
+index = events.load()
+first, last = index.span()
+years = list(range(int(str(first)[:4]), int(str(last)[:4]) + 1))
+start, end = st.select_slider('Years', options=years, value=(years[0], years[-1]))
+
+doc = index.timeline('%d-01-01' % start, '%d-12-31' % end)
+if doc['events']:
+    # render timeline
+    timeline(json.dumps(doc), height=800)
+else:
+    st.info('No events between %d and %d.' % (start, end))
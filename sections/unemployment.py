@@ -0,0 +1,29 @@
+# Unemployment section of the case study (see main.py).
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from housing import figures
+from housing import ui
+
+st.header('Unemployment')
+colm1,colm2 = st.columns((3,4))
+fig = figures.get('unemployment')
+colm2.plotly_chart(fig)
+with colm2.expander('Full history'):
+    ui.full_history({'UNRATE': 'Unemployment Rate in %'}, key='unemployment_history')
+
+with colm1:
+    components.iframe("https://d3fy651gv2fhd3.cloudfront.net/embed/?s=usurtot&v=202203041337V20200908&d1=19970314&type=type=line&title=false&url2=/united-states/case-shiller-home-price-index&h=300&w=600",width=600, height=300, scrolling=False)
+    st.write("Unemployment tracks the business cycle. Recessions are part of that cycle and can cause high unemployment. Businesses often lay off workers and, without an income, those jobless workers have less money to spend.")
+
+
+st.write('''
+Lower consumer spending reduces business revenue, which forces companies to cut more payroll. This downward cycle can be devastating to individuals and the economy.
+When unemployment is rising, fewer people will be able to afford a house. But, even the fear of unemployment may discourage people from entering the property market.
+An increase in jobs, employees and wages consequently results in an increase in income for all workers in a country. With that, an increase in income also increases the demand for affordable housing.
+\nDuring the Great Recession, unemployment reached 10% in October 2009. 
+In 2020, it reached double digits again at 14.7% in April when the U.S. was dealing with a pandemic and recession.
+The US unemployment rate edged down to 3.8 percent in February of 2022 from 4 percent in the previous month, a new pandemic low and below market expectations of 3.9 percent. The number of unemployed persons edged down by 243 thousand to 6.270 million.
+
+''')
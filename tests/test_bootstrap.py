@@ -0,0 +1,51 @@
+# The batched moving-block bootstrap on the combined data.
+
+import numpy as np
+import pytest
+
+from housing import bootstrap
+from housing import data as datasets
+from housing.bootstrap import TARGET
+
+
+@pytest.fixture(scope='module')
+def combined():
+    return datasets.load('combined').drop(columns=['DATE'])
+
+
+def test_blocks_are_contiguous():
+    rng = np.random.default_rng(1)
+    n, block = 23, 4
+    idx = bootstrap.block_indices(n, block, 500, rng)
+    assert idx.shape == (500, n)
+    assert idx.min() >= 0 and idx.max() < n
+    # Every block starts anywhere but then runs over consecutive rows.
+    steps = np.diff(idx.reshape(500, -1)[:, :n // block * block].reshape(500, -1, block), axis=2)
+    assert (steps == 1).all()
+
+
+def test_correlation_intervals_contain_the_estimate(combined):
+    ci = bootstrap.correlation_ci(combined, size=2000, seed=7)
+    low, high = ci.columns[1], ci.columns[2]
+    assert (ci[low] <= ci[TARGET]).all() and (ci[TARGET] <= ci[high]).all()
+    assert (ci[low] < ci[high]).all()
+    # Same seed, same intervals.
+    np.testing.assert_array_equal(ci, bootstrap.correlation_ci(combined, size=2000, seed=7))
+
+
+def test_batch_ols_matches_lstsq(combined):
+    factors = ['Population', 'Mortgage', 'Unemployment']
+    data = combined[factors + [TARGET]].dropna()
+    X = data[factors].to_numpy(dtype='float64')
+    y = data[TARGET].to_numpy(dtype='float64')
+    idx = bootstrap.block_indices(len(y), 3, 200, np.random.default_rng(3))
+    beta = bootstrap.batch_ols(X[idx], y[idx])
+    checked = 0
+    for b in range(len(idx)):
+        A = np.column_stack([np.ones(len(y)), X[idx[b]]])
+        if np.linalg.matrix_rank(A) < A.shape[1]:
+            continue
+        expected = np.linalg.lstsq(A, y[idx[b]], rcond=None)[0]
+        np.testing.assert_allclose(beta[b], expected, rtol=1e-6, atol=1e-9 * np.abs(expected).max())
+        checked += 1
+    assert checked > 150
@@ -0,0 +1,47 @@
+# PELT against an unpruned search over every segmentation.
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from housing import changepoints
+from housing.store import open_store
+
+
+def cost(z, breaks, penalty, floor=1e-3):
+    """Penalized Gaussian cost of splitting ``z`` at ``breaks``, as pelt() scores it."""
+    total = penalty * len(breaks)
+    for seg in np.split(z, breaks):
+        total += len(seg) * np.log(seg.var() + floor)
+    return total
+
+
+def exhaustive(x, penalty, min_size):
+    """Reference implementation: the cheapest of all segmentations, tried one by one."""
+    z = (x - x.mean()) / (x.std() or 1.0)
+    n = len(z)
+    best, best_cost = (), cost(z, [], penalty)
+    for k in range(1, n // min_size):
+        for breaks in combinations(range(min_size, n - min_size + 1), k):
+            if min(np.diff((0,) + breaks + (n,))) < min_size:
+                continue
+            c = cost(z, list(breaks), penalty)
+            if c < best_cost - 1e-9:
+                best, best_cost = breaks, c
+    return np.array(best, dtype=np.int64)
+
+
+@pytest.mark.parametrize('sid, start, end', [
+    ('MEHOINUSA672N', None, None),
+    ('CSUSHPISA', '2005-01-01', '2006-12-01'),
+    ('UNRATE', '2007-06-01', '2009-03-01'),
+    ('MORTGAGE30US', '2020-01-01', '2020-06-01'),
+])
+def test_pelt_matches_exhaustive_search(sid, start, end):
+    values = np.diff(open_store().arrays(sid, start, end)[1])
+    values = values[~np.isnan(values)][:18]
+    penalty = 3 * np.log(len(values))
+    for min_size in (2, 3):
+        expected = exhaustive(values, penalty, min_size)
+        np.testing.assert_array_equal(changepoints.pelt(values, penalty, min_size), expected)
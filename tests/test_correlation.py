@@ -0,0 +1,72 @@
+# The vectorized correlation kernels against pandas on the real data.
+
+import numpy as np
+import pytest
+
+from housing import align
+from housing import data as datasets
+from housing import correlation
+from housing.correlation import TARGET
+
+
+@pytest.fixture(scope='module')
+def monthly():
+    return align.build_combined('ME', start='1987', fill='interpolate')
+
+
+def test_rolling_corr_matches_pandas(monthly):
+    window = 36
+    fast = correlation.rolling_corr(monthly, window=window, min_periods=24)
+    for factor in fast.columns:
+        slow = monthly[factor].rolling(window, min_periods=24).corr(monthly[TARGET])
+        np.testing.assert_allclose(fast[factor], slow.clip(-1, 1), atol=1e-6)
+
+
+def lagged_corr_reference(df, max_lag, min_periods):
+    """Reference implementation: one shifted, pairwise-complete corr per pair and lag."""
+    X = df.to_numpy(dtype='float64')
+    n, p = X.shape
+    cube = np.full((p, p, max_lag + 1), np.nan)
+    for k in range(max_lag + 1):
+        for i in range(p):
+            for j in range(p):
+                x, y = X[:n - k, i], X[k:, j]
+                both = ~np.isnan(x) & ~np.isnan(y)
+                if both.sum() >= min_periods and x[both].std() > 0 and y[both].std() > 0:
+                    cube[i, j, k] = np.corrcoef(x[both], y[both])[0, 1]
+    return cube
+
+
+def test_lagged_corr_matches_shifted_corr(monthly):
+    fast = correlation.lagged_corr(monthly, max_lag=36, min_periods=12)
+    slow = lagged_corr_reference(monthly, max_lag=36, min_periods=12)
+    np.testing.assert_allclose(fast, slow, atol=1e-6)
+
+
+def _residuals(Z, y):
+    A = np.column_stack([np.ones(len(Z)), Z])
+    return y - A @ np.linalg.lstsq(A, y, rcond=None)[0]
+
+
+def test_partial_correlations_match_regressions():
+    df = datasets.load('combined').drop(columns=['DATE']).dropna()
+    partial, vif = correlation.partial_correlations(df)
+    columns = list(partial.columns)
+    X = df[columns].to_numpy(dtype='float64')
+    for i in range(len(columns)):
+        for j in range(i + 1, len(columns)):
+            if np.isnan(partial.iloc[i, j]):
+                continue
+            rest = np.delete(X, [i, j], axis=1)
+            ri, rj = _residuals(rest, X[:, i]), _residuals(rest, X[:, j])
+            assert partial.iloc[i, j] == pytest.approx(np.corrcoef(ri, rj)[0, 1], abs=1e-6)
+
+    factors = [c for c in columns if c != TARGET]
+    F = df[factors].to_numpy(dtype='float64')
+    for k, factor in enumerate(factors):
+        resid = _residuals(np.delete(F, k, axis=1), F[:, k])
+        r2 = 1.0 - resid @ resid / ((F[:, k] - F[:, k].mean()) ** 2).sum()
+        if np.isinf(vif[factor]):
+            assert r2 > 1 - 1e-8
+        else:
+            assert vif[factor] == pytest.approx(1.0 / (1.0 - r2), rel=1e-6)
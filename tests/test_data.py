@@ -0,0 +1,50 @@
+# The shared dataset cache: parse once, re-parse only on a content change.
+
+import os
+
+import pandas as pd
+
+from housing.data import DataCache
+
+
+def _write(path, rows):
+    pd.DataFrame({'DATE': ['2000-01-01'] * rows, 'value': range(rows)}).to_csv(path, index=False)
+
+
+def test_cache_reparses_only_on_content_change(tmp_path):
+    path = str(tmp_path / 'series.csv')
+    _write(path, 3)
+    cache = DataCache()
+    first = cache.load(path)
+    assert cache.load(path) is first
+    version = cache.version(path)
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'entries': 1}
+
+    # Touched but unchanged: same frame, same version.
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert cache.load(path) is first
+    assert cache.version(path) == version
+
+    _write(path, 4)
+    assert len(cache.load(path)) == 4
+    assert cache.version(path) != version
+    assert cache.stats()['misses'] == 2
+
+
+def test_version_does_not_parse_or_count(tmp_path):
+    path = str(tmp_path / 'series.csv')
+    _write(path, 3)
+    cache = DataCache()
+    cache.version(path)
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'entries': 0}
+
+
+def test_unhashable_reader_arguments(tmp_path):
+    path = str(tmp_path / 'series.csv')
+    _write(path, 3)
+    cache = DataCache()
+    df = cache.load(path, usecols=['value'])
+    assert list(df.columns) == ['value']
+    assert cache.load(path, usecols=['value']) is df
+    assert list(cache.load(path).columns) == ['DATE', 'value']
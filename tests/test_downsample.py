@@ -0,0 +1,96 @@
+# The vectorized reducers against one-bucket-at-a-time loops.
+
+import numpy as np
+import pytest
+
+from housing import downsample
+from housing.store import open_store
+
+SERIES = ['MORTGAGE30US', 'CSUSHPISA', 'UNRATE']
+
+
+def lttb_areas(x, y, n, picked):
+    """Reference implementation: LTTB as published, one bucket at a time.
+
+    Returns, for every bucket, the triangle area of the point ``picked``
+    kept there and the largest area any of its points forms, both measured
+    from the point ``picked`` kept in the bucket before.
+    """
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    size = len(x)
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    got, best = [], []
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < n - 2:
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        a = picked[i]
+        assert lo <= picked[i + 1] < hi
+        areas = [abs((x[a] - cx) * (y[j] - y[a]) - (x[a] - x[j]) * (cy - y[a])) for j in range(lo, hi)]
+        got.append(areas[picked[i + 1] - lo])
+        best.append(max(areas))
+    return np.array(got), np.array(best)
+
+
+def minmax_loop(y, n):
+    """Reference implementation: the extremes of every bucket, bucket by bucket."""
+    size = len(y)
+    if n >= size or size <= 2:
+        return np.arange(size)
+    buckets = max((n - 2) // 2, 1)
+    edges = np.linspace(1, size - 1, buckets + 1).astype(np.int64)
+    keep = {0, size - 1}
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        keep.add(lo + int(np.argmin(y[lo:hi])))
+        keep.add(lo + int(np.argmax(y[lo:hi])))
+    return np.array(sorted(keep))
+
+
+@pytest.mark.parametrize('sid', SERIES)
+@pytest.mark.parametrize('n', [3, 4, 50, 333, 1000])
+def test_lttb_matches_loop(sid, n):
+    dates, values = open_store().arrays(sid)
+    x = dates.astype('datetime64[s]').astype(np.int64)
+    picked = downsample.lttb(dates, values, n)
+    assert len(picked) == min(n, len(values))
+    assert picked[0] == 0 and picked[-1] == len(values) - 1
+    if n >= len(values):
+        return
+    # Weekly and monthly values tie often; either tied point is a valid pick,
+    # so compare areas rather than indices.
+    got, best = lttb_areas(x, values, n, picked)
+    np.testing.assert_allclose(got, best, rtol=1e-9)
+
+
+@pytest.mark.parametrize('sid', SERIES)
+@pytest.mark.parametrize('n', [3, 10, 200, 1001])
+def test_minmax_matches_loop(sid, n):
+    dates, values = open_store().arrays(sid)
+    picked = downsample.minmax(dates, values, n)
+    np.testing.assert_array_equal(picked, minmax_loop(np.asarray(values, dtype=np.float64), n))
+    # Every bucket keeps its extremes, so the series' own survive too.
+    assert values.argmin() in picked and values.argmax() in picked
+    assert picked[0] == 0 and picked[-1] == len(values) - 1
+
+
+def test_lttb_keeps_an_isolated_spike():
+    x = np.arange(10000, dtype=np.float64)
+    y = np.sin(x / 500)
+    y[4321] = 50.0
+    y[7777] = -50.0
+    picked = downsample.lttb(x, y, 100)
+    assert 4321 in picked and 7777 in picked
+
+
+def test_downsample_drops_missing_values():
+    x = np.arange(1000)
+    y = np.cos(x / 50.0)
+    y[::7] = np.nan
+    for method in downsample.METHODS:
+        dx, dy = downsample.downsample(x, y, 100, method)
+        assert not np.isnan(dy).any()
+        assert dx[0] == 1 and dx[-1] == 999
+        np.testing.assert_array_equal(dy, y[dx])
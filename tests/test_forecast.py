@@ -0,0 +1,64 @@
+# Recursive least squares in the walk-forward backtest against refitting OLS
+# from scratch at every forecast origin.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from housing import align
+from housing import forecast
+from housing.regression import TARGET
+from housing.store import open_store
+
+
+def refit_forecasts(df, factors, target=TARGET, horizon=1, min_train=60):
+    """Reference implementation: refit OLS from scratch at every origin."""
+    factors = list(factors)
+    X = np.column_stack([np.ones(len(df)), df[factors].to_numpy(dtype='float64')])
+    y = df[target].to_numpy(dtype='float64')
+    N = len(y) - horizon
+    pred = np.full(N, np.nan)
+    for j in range(N):
+        rows = [i for i in range(j - horizon + 1)
+                if not np.isnan(X[i]).any() and not np.isnan(y[i + horizon])]
+        if len(rows) >= min_train and not np.isnan(X[j]).any():
+            coef = np.linalg.lstsq(X[rows], y[[i + horizon for i in rows]], rcond=None)[0]
+            pred[j] = X[j] @ coef
+    return pd.Series(pred, index=df.index[horizon:])
+
+
+@pytest.fixture(scope='module')
+def monthly():
+    return forecast.released_history('ME', start='1987')
+
+
+@pytest.mark.parametrize('horizon', [1, 12])
+def test_walk_forward_matches_refitting(monthly, horizon):
+    factors = ['Income', 'Population', 'Unemployment', 'Mortgage', 'Foreclosures']
+    bt = forecast.walk_forward(monthly, factors, horizon=horizon, max_size=2)
+    for model in ['Mortgage', 'Income, Unemployment', 'Population, Foreclosures']:
+        slow = refit_forecasts(monthly, model.split(', '), horizon=horizon)
+        fast = bt.predictions[model]
+        assert fast.notna().sum() > 0
+        # What is left is the bias of RLS's diffuse prior (a 1e-6 ridge),
+        # largest for the annual series that change only once a year.
+        np.testing.assert_allclose(fast, slow, rtol=1e-5)
+
+
+def test_target_is_not_carried_past_its_last_release(monthly):
+    last = open_store().series(TARGET).index.max() + pd.offsets.MonthEnd(0)
+    target = monthly[TARGET]
+    assert target.last_valid_index() == last
+    assert monthly.index.max() > last
+    assert target[target.index > last].isna().all()
+
+
+@pytest.mark.parametrize('freq', ['ME', 'QE', 'YE'])
+def test_release_lags_count_from_observation_dates(freq):
+    # The 2019 median income, dated 2019-01-01, counts as released 21 months
+    # later, in October 2020, and must first show up in the period holding
+    # that month at every frequency.
+    df = align.build_combined(freq, start='2015', fill='ffill', released=True)
+    income = open_store().series('MEHOINUSA672N')
+    first = df.index[df['Income'] == income['2019-01-01']].min()
+    assert first == pd.Timestamp('2020-10-01').to_period(align.period_alias(freq)).to_timestamp(how='end').normalize()
@@ -0,0 +1,73 @@
+# The batched panel regressions and correlations against one fit per region.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from housing import align
+from housing import panel
+from housing import regression
+
+FACTORS = ['Mortgage', 'Unemployment', 'Income']
+
+
+@pytest.fixture(scope='module')
+def factors():
+    df = align.build_combined('QE', start='1990', end='2020', fill='interpolate')[FACTORS]
+    # A factor gap drops those periods from every region's fit.
+    df.iloc[[0, 1, 2, 40], FACTORS.index('Income')] = np.nan
+    return df
+
+
+@pytest.fixture(scope='module')
+def regional(factors, tmp_path_factory):
+    """Regional indices in FRED's CSV layout, with their own gaps and spans."""
+    rng = np.random.default_rng(11)
+    directory = tmp_path_factory.mktemp('regional')
+    months = pd.date_range('1988-01-01', '2021-12-01', freq='MS')
+    monthly = factors.reindex(months, method='bfill').ffill().bfill().to_numpy()
+    z = (monthly - np.nanmean(monthly, axis=0)) / np.nanstd(monthly, axis=0)
+    for i, sid in enumerate(['SFXRSA', 'NYXRSA', 'CASTHPI', 'TXSTHPI', 'DAXRSA']):
+        weights = rng.normal(size=len(FACTORS))
+        values = 100 + 10 * i + z @ weights * 5 + rng.normal(scale=1 + i, size=len(months))
+        values[rng.random(len(months)) < 0.1] = np.nan
+        values[:24 * i] = np.nan
+        pd.DataFrame({'DATE': months.strftime('%Y-%m-%d'),
+                      sid: np.where(np.isnan(values), '.', values.round(3).astype(str))}
+                     ).to_csv(directory / ('%s.csv' % sid), index=False)
+    return panel.Panel.load(str(directory), freq='QE', start='1990', end='2020')
+
+
+def test_regress_matches_ols_per_region(regional, factors):
+    fits = regional.regress(factors)
+    frame = regional.frame()
+    for region in regional.regions:
+        res = regression.ols(factors.assign(**{region: frame[region]}), FACTORS, target=region)
+        row = fits.loc[region]
+        assert row['Observations'] == res.n
+        np.testing.assert_allclose(row[['R-squared', 'Adj. R-squared']].to_numpy(dtype=float),
+                                   [res.r2, res.adj_r2], rtol=1e-9)
+        np.testing.assert_allclose(row['Prob (F-statistic)'], res.f_pvalue, rtol=1e-6, atol=1e-300)
+        table = res.coefficients()
+        for term in table.index:
+            np.testing.assert_allclose(row[term], table.loc[term, 'coef'], rtol=1e-7)
+            np.testing.assert_allclose(row['P>|t| ' + term], table.loc[term, 'P>|t|'], rtol=1e-6, atol=1e-12)
+
+
+def test_correlations_match_single_factor_fits(regional, factors):
+    corr = regional.correlations(factors)
+    frame = regional.frame()
+    for region in regional.regions:
+        for factor in FACTORS:
+            res = regression.ols(factors.assign(**{region: frame[region]}), [factor], target=region)
+            expected = np.sign(res.coef[1]) * np.sqrt(res.r2)
+            np.testing.assert_allclose(corr.loc[region, factor], expected, rtol=1e-9)
+            np.testing.assert_allclose(corr.loc[region, factor], frame[region].corr(factors[factor]), rtol=1e-9)
+
+
+def test_correlations_need_min_periods(regional, factors):
+    short = factors.copy()
+    short.iloc[5:, 0] = np.nan
+    corr = regional.correlations(short, min_periods=8)
+    assert corr[FACTORS[0]].isna().all()
+    assert corr[FACTORS[1:]].notna().all().all()
@@ -0,0 +1,50 @@
+# The reduceat pyramid against pandas resample().
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from housing import pyramid
+from housing.pyramid import LEVELS, STATS, open_pyramid
+from housing.store import DATE_DTYPE, open_store
+
+SERIES = ['MORTGAGE30US', 'CSUSHPISA', 'UNRATE', 'MEHOINUSA672N']
+
+
+@pytest.mark.parametrize('level', list(LEVELS))
+@pytest.mark.parametrize('sid', SERIES)
+def test_levels_match_resample(sid, level):
+    raw = open_store().series(sid).dropna()
+    expected = raw.resample(level).agg(list(STATS)).dropna()
+    built = open_pyramid()
+    for stat in STATS:
+        got = built.series(sid, level, stat)
+        np.testing.assert_array_equal(got.index.values, expected.index.values)
+        np.testing.assert_allclose(got.values, expected[stat].values, rtol=1e-12)
+
+
+def test_weekly_periods_match_resample():
+    # Every weekday of several years, so each day of the week opens and
+    # closes a period somewhere.
+    dates = pd.date_range('1999-12-20', '2004-01-10', freq='D')
+    rng = np.random.default_rng(3)
+    dates = dates[np.sort(rng.choice(len(dates), size=600, replace=False))]
+    values = rng.normal(size=len(dates))
+    groups = np.zeros(len(dates), dtype=np.int64)
+
+    rows, ends, stats = pyramid.aggregate(dates.values.astype(DATE_DTYPE), values, groups, 'W')
+    expected = pd.Series(values, index=dates).resample('W').agg(list(STATS)).dropna()
+    np.testing.assert_array_equal(ends.astype('datetime64[ns]'), expected.index.values)
+    np.testing.assert_allclose(stats, expected[list(STATS)].values, rtol=1e-12)
+
+
+def test_groups_do_not_mix():
+    # Two series sharing the same periods are aggregated separately.
+    dates = np.tile(pd.date_range('2020-01-01', periods=90, freq='D').values.astype(DATE_DTYPE), 2)
+    values = np.concatenate([np.ones(90), np.full(90, 5.0)])
+    values[[10, 120]] = np.nan
+    groups = np.repeat([0, 1], 90)
+    rows, ends, stats = pyramid.aggregate(dates, values, groups, 'ME')
+    np.testing.assert_array_equal(rows, [0, 0, 0, 1, 1, 1])
+    np.testing.assert_array_equal(stats[:3], 1.0)
+    np.testing.assert_array_equal(stats[3:], 5.0)
@@ -0,0 +1,45 @@
+# The sweep-based best-subset search against refitting every subset.
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from housing import data as datasets
+from housing import regression
+from housing.regression import TARGET
+
+
+def brute_force_subsets(df, factors, target=TARGET):
+    """Reference implementation: refit every subset from scratch."""
+    rows = []
+    for k in range(1, len(factors) + 1):
+        for subset in combinations(factors, k):
+            res = regression.ols(df, subset, target)
+            rows.append((', '.join(subset), k, res.r2, res.adj_r2))
+    return pd.DataFrame(rows, columns=['factors', 'k', 'R-squared', 'Adj. R-squared'])
+
+
+@pytest.fixture(scope='module')
+def combined():
+    return datasets.load('combined').drop(columns=['DATE'])
+
+
+def test_best_subsets_matches_brute_force(combined):
+    factors = [c for c in combined.columns if c != TARGET]
+    swept = regression.best_subsets(combined).set_index('factors')
+    brute = brute_force_subsets(combined, factors).set_index('factors')
+    # The sweep drops collinear subsets; every subset it keeps must agree.
+    brute = brute[brute['Adj. R-squared'].notna()]
+    assert set(swept.index) <= set(brute.index)
+    assert len(swept) == len(brute)
+    brute = brute.loc[swept.index]
+    np.testing.assert_allclose(swept['R-squared'], brute['R-squared'], atol=1e-9)
+    np.testing.assert_allclose(swept['Adj. R-squared'], brute['Adj. R-squared'], atol=1e-9)
+
+
+def test_t_isf2_inverts_t_sf2():
+    for df in (3, 12, 40):
+        for p in (0.2, 0.05, 0.01):
+            assert regression.t_sf2(regression.t_isf2(p, df), df) == pytest.approx(p, rel=1e-8)